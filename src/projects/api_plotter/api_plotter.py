@@ -1,6 +1,11 @@
 import argparse
 from pathlib import Path
-from .data_handler import build_url, fetch_json, to_dataframe, fetch_city_dataframe
+
+import pandas as pd
+
+from .http_cache import ResponseCache, DEFAULT_MAX_BYTES
+from .timeseries_store import TimeSeriesStore
+from .data_handler import BASE_URL, MAX_BATCH_LOCATIONS, build_url, fetch_json, to_dataframe, fetch_city_dataframe, fetch_cities
 from .plot_util import plot_single, plot_multi, ensure_plot_dir
 from .insight_util import compute_basic_stats, generate_insights, save_insights
 
@@ -25,11 +30,27 @@ def get_args():
     # get the variable to fetch from the input
     p.add_argument("--vars", nargs="+", default=["temperature_2m"], help="Variables to fetch")
 
-    # get the folder path to save the csv and plot png
+    # get the folder path to save the history store and plot png
     p.add_argument("--out", type=Path, default=DEFAULT_OUT, help="Output folder")
 
     p.add_argument("--insights", action="store_true",
                    help="Generate insights text files for each city")
+
+    # fetching: how many cities are downloaded at once, and from where (e.g. a local stub server)
+    p.add_argument("--concurrency", type=int, default=8, help="Max concurrent requests")
+    p.add_argument("--base-url", default=BASE_URL, help="Forecast API endpoint")
+    p.add_argument("--batch", type=int, nargs="?", const=MAX_BATCH_LOCATIONS, default=None,
+                   help=f"Group cities into multi-location requests (default {MAX_BATCH_LOCATIONS} per request)")
+
+    # response cache: repeat runs within the hour reuse the stored forecast
+    p.add_argument("--cache-dir", type=Path, default=None, help="Response cache folder (default: <out>/cache)")
+    p.add_argument("--cache-mb", type=float, default=DEFAULT_MAX_BYTES / 2**20, help="Response cache size limit in MB")
+    p.add_argument("--no-cache", action="store_true", help="Always download, never read or write the cache")
+
+    # history: every run adds its hours to <out>/history.sqlite, plots read back from there
+    p.add_argument("--past-days", type=int, default=1, help="Days of past data requested per run")
+    p.add_argument("--history-days", type=float, default=None,
+                   help="Days of stored history to plot (default: everything stored)")
     return p.parse_args()
 
 def get_city_coords(city_name: str):
@@ -71,30 +92,44 @@ def run():
     print("out: ", args.out)
 
     # prepare output directories
-    csv_root = args.out / "csv"
-    csv_root.mkdir(parents=True, exist_ok=True)
-
     insights_root = args.out / "insights"
     insights_root.mkdir(parents=True, exist_ok=True)
 
-    df_cities = {}
-    for city in args.cities:
-        # get lat and lon from the city
-        lat, lon = get_city_coords(city)
-
-        # construct the dataframe using the function we just made and save 
-        df = fetch_city_dataframe(city, lon, lat, args.vars)
-        df_cities[city] = df
+    # get lat and lon for every city, then fetch them all concurrently
+    coords = {city: get_city_coords(city) for city in args.cities}
+
+    cache = None
+    if not args.no_cache:
+        cache_dir = args.cache_dir if args.cache_dir is not None else args.out / "cache"
+        cache = ResponseCache(cache_dir / "responses.sqlite", max_bytes=int(args.cache_mb * 2**20))
+
+    try:
+        df_cities = fetch_cities(coords, args.vars, max_workers=args.concurrency,
+                                 base_url=args.base_url, batch_size=args.batch, cache=cache,
+                                 past_days=args.past_days)
+    finally:
+        if cache is not None:
+            cache.close()
+
+    # add the new hours to the history, then continue with the stored history
+    store = TimeSeriesStore(args.out / "history.sqlite")
+    start = None
+    if args.history_days is not None:
+        start = pd.Timestamp.now(tz="UTC").tz_localize(None) - pd.Timedelta(days=args.history_days)
+
+    try:
+        for city, df in df_cities.items():
+            new = store.append(city, df, args.vars)
+            df_cities[city] = store.read(city, args.vars, start=start)
+            print(f"Stored {new} new hours for {city} ({len(df_cities[city])} in history)")
+    finally:
+        store.close()
 
+    for city, df in df_cities.items():
         stats = compute_basic_stats(df)
         insights = generate_insights(city, stats)
         save_insights(city, stats, insights, insights_root)
 
-        # save csv per city
-        csv_path = csv_root / f"{city}.csv"
-        df.to_csv(csv_path, index=False)
-        print(f"Saved CSV for {city} -> {csv_path}")
-
     plot_root = args.out / "plots"
 
     for var in args.vars:
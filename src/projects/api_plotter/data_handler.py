@@ -1,34 +1,235 @@
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
 import requests
 import pandas as pd
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from .http_cache import ResponseCache
+
+# orjson parses large payloads several times faster; plain json works the same without it
+try:
+    import orjson
+    loads = orjson.loads
+except ImportError:
+    loads = json.loads
+
+BASE_URL = "https://api.open-meteo.com/v1/forecast"
+
+# HTTP statuses worth retrying (rate limiting / transient server errors)
+RETRY_STATUSES = (429, 500, 502, 503, 504)
 
-def build_url(lat:float, lon:float, variables: list[str]) -> str:
+# batched requests: Open-Meteo takes comma separated coordinate lists, but keep
+# each request to a bounded number of locations and a URL most servers accept
+MAX_BATCH_LOCATIONS = 100
+MAX_URL_LENGTH = 8000
+
+# timestamps as they come back from build_url (timeformat=unixtime) or from a plain ISO request
+ISO_TIME_FORMAT = "%Y-%m-%dT%H:%M"
+
+def build_url(lat:float, lon:float, variables: list[str], base_url: str = BASE_URL, past_days: int = 1) -> str:
     items = ",".join(variables)
     return (
-        "https://api.open-meteo.com/v1/forecast?"
+        f"{base_url}?"
         f"latitude={lat}&longitude={lon}"
-        f"&hourly={items}&past_days=1"       
+        f"&hourly={items}&past_days={past_days}"
+        f"&timeformat=unixtime"
+    )
+
+def build_batch_url(coords: list[tuple[float, float]], variables: list[str], base_url: str = BASE_URL,
+                    past_days: int = 1) -> str:
+    """
+    One URL for many (lat, lon) pairs; the API answers with a list of payloads in the same order.
+    """
+    lats = ",".join(str(lat) for lat, _ in coords)
+    lons = ",".join(str(lon) for _, lon in coords)
+    return build_url(lats, lons, variables, base_url, past_days)
+
+def chunk_locations(coords: dict, variables: list[str], base_url: str = BASE_URL,
+                    max_locations: int = MAX_BATCH_LOCATIONS, max_url_length: int = MAX_URL_LENGTH) -> list[list[str]]:
+    """
+    Split {city: (lat, lon)} into groups of cities, each fitting in one batched request.
+
+    A group closes when it reaches max_locations or when one more coordinate pair
+    would push its URL past max_url_length.
+    """
+    fixed = len(build_url("", "", variables, base_url))
+
+    chunks = []
+    current, length = [], fixed
+    for city, (lat, lon) in coords.items():
+        # both lists grow by the value plus a separating comma
+        extra = len(str(lat)) + len(str(lon)) + 2
+        if current and (len(current) >= max_locations or length + extra > max_url_length):
+            chunks.append(current)
+            current, length = [], fixed
+        current.append(city)
+        length += extra
+
+    if current:
+        chunks.append(current)
+    return chunks
+
+def make_session(pool_size: int = 8, retries: int = 3, backoff: float = 0.5) -> requests.Session:
+    """
+    Shared session for concurrent fetches.
+
+    Keeps up to pool_size connections alive per host (so every request reuses one)
+    and retries connection errors and RETRY_STATUSES with exponential backoff
+    (backoff, 2*backoff, 4*backoff, ... seconds; Retry-After is honoured).
+    """
+    retry = Retry(
+        total=retries,
+        backoff_factor=backoff,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=frozenset(["GET"]),
+        respect_retry_after_header=True,
     )
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+def fetch_json(url:str, session: requests.Session | None = None, cache: ResponseCache | None = None) -> dict:
+    """
+    GET url and decode the JSON body.
+
+    With a cache, a fresh entry is returned without any request and a stale one
+    is revalidated (304 -> reuse the stored body).
+    """
+    getter = session.get if session is not None else requests.get
+
+    if cache is None:
+        r = getter(url, timeout=20)
+        r.raise_for_status()
+        return loads(r.content)
+
+    headers = {}
+    entry = cache.lookup(url)
+    if entry is not None:
+        body, etag, last_modified, fresh = entry
+        if fresh:
+            return loads(body)
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+
+    r = getter(url, timeout=20, headers=headers)
+    if r.status_code == 304 and entry is not None:
+        cache.refresh(url)
+        return loads(entry[0])
 
-def fetch_json(url:str) -> dict:
-    r = requests.get(url, timeout=20)
     r.raise_for_status()
-    return r.json()
+    cache.store(url, r.content, r.headers.get("ETag"), r.headers.get("Last-Modified"))
+    return loads(r.content)
+
+def parse_times(times: list) -> pd.DatetimeIndex:
+    """
+    Hourly timestamps as epoch seconds (timeformat=unixtime) or ISO strings in ISO_TIME_FORMAT.
+    """
+    if times and isinstance(times[0], str):
+        return pd.to_datetime(times, format=ISO_TIME_FORMAT)
+    return pd.to_datetime(np.asarray(times, dtype=np.int64), unit="s")
 
 def to_dataframe(payload: dict, variables:list[str]) -> pd.DataFrame:
-    df = pd.DataFrame()
-    df['time'] = pd.to_datetime(payload['hourly']['time'])
+    """
+    Build the frame in one go from the columnar "hourly" arrays.
 
-    for var in variables:
-        df[var] = payload["hourly"][var]
+    Rows where any variable is missing (null) are dropped before the frame is built.
+    """
+    hourly = payload["hourly"]
+    time = parse_times(hourly["time"])
 
-    df = df.dropna().reset_index(drop=True)
-    return df
+    # null -> NaN on conversion
+    columns = {var: np.asarray(hourly[var], dtype=float) for var in variables}
 
-def fetch_city_dataframe(city: str, lon: float, lat: float, vars_list: list) -> pd.DataFrame:
-    url = build_url(lat, lon, vars_list)
+    keep = np.ones(len(time), dtype=bool)
+    for values in columns.values():
+        keep &= ~np.isnan(values)
+
+    if not keep.all():
+        time = time[keep]
+        columns = {var: values[keep] for var, values in columns.items()}
+
+    return pd.DataFrame({"time": time, **columns})
+
+def fetch_city_dataframe(city: str, lon: float, lat: float, vars_list: list,
+                         session: requests.Session | None = None, base_url: str = BASE_URL,
+                         cache: ResponseCache | None = None, past_days: int = 1) -> pd.DataFrame:
+    url = build_url(lat, lon, vars_list, base_url, past_days)
     print(f"fetching [{city}] -> {url}")
 
-    payload = fetch_json(url)
+    payload = fetch_json(url, session, cache)
     df = to_dataframe(payload, vars_list)
 
-    return df
\ No newline at end of file
+    return df
+
+def fetch_batch_dataframes(coords: dict, vars_list: list,
+                           session: requests.Session | None = None, base_url: str = BASE_URL,
+                           cache: ResponseCache | None = None, past_days: int = 1) -> dict:
+    """
+    Fetch a group of cities with one request and split the response per city.
+
+    coords: {city: (lat, lon)}, small enough for one URL (see chunk_locations)
+    Returns {city: DataFrame}.
+    """
+    url = build_batch_url(list(coords.values()), vars_list, base_url, past_days)
+    print(f"fetching [{len(coords)} cities] -> {url[:120]}{'...' if len(url) > 120 else ''}")
+
+    payload = fetch_json(url, session, cache)
+
+    # a single location comes back as a bare object, several as a list in request order
+    payloads = payload if isinstance(payload, list) else [payload]
+    if len(payloads) != len(coords):
+        raise ValueError(f"expected {len(coords)} locations in the response, got {len(payloads)}")
+
+    return {city: to_dataframe(p, vars_list) for city, p in zip(coords, payloads)}
+
+def fetch_cities(coords: dict, vars_list: list, max_workers: int = 8,
+                 session: requests.Session | None = None, base_url: str = BASE_URL,
+                 batch_size: int | None = None, cache: ResponseCache | None = None,
+                 past_days: int = 1) -> dict:
+    """
+    Fetch every city concurrently.
+
+    coords: {city: (lat, lon)}
+    At most max_workers requests are in flight; they share one session, so
+    connections are reused and failed requests are retried (see make_session).
+    With batch_size, cities are grouped into batched requests of up to that many
+    locations (and MAX_URL_LENGTH), so N cities take about N / batch_size requests.
+    With a cache, responses are reused across runs (see fetch_json).
+    past_days: days of history before today included in every response.
+    Returns {city: DataFrame} in the same order as coords; the first failure is raised.
+    """
+    own_session = session is None
+    if own_session:
+        session = make_session(pool_size=max_workers)
+
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            if batch_size:
+                chunks = chunk_locations(coords, vars_list, base_url, max_locations=batch_size)
+                futures = [
+                    pool.submit(fetch_batch_dataframes, {city: coords[city] for city in chunk},
+                                vars_list, session, base_url, cache, past_days)
+                    for chunk in chunks
+                ]
+                frames = {}
+                for future in futures:
+                    frames.update(future.result())
+                return {city: frames[city] for city in coords}
+
+            futures = {
+                city: pool.submit(fetch_city_dataframe, city, lon, lat, vars_list, session,
+                                  base_url, cache, past_days)
+                for city, (lat, lon) in coords.items()
+            }
+            return {city: future.result() for city, future in futures.items()}
+    finally:
+        if own_session:
+            session.close()
@@ -0,0 +1,124 @@
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+# Open-Meteo refreshes its forecast hourly, so a response stays fresh until the next full hour
+TTL_BOUNDARY = 3600
+
+# default size bound of the cache file contents (response bodies), in bytes
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key           TEXT PRIMARY KEY,
+    body          BLOB NOT NULL,
+    etag          TEXT,
+    last_modified TEXT,
+    expires_at    REAL NOT NULL,
+    accessed_at   REAL NOT NULL,
+    size          INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_lru ON responses (accessed_at);
+"""
+
+def normalize_url(url: str) -> str:
+    """
+    Cache key of a URL: lower-case scheme and host, query parameters sorted by name.
+
+    Parameter values are kept verbatim (the order inside a coordinate list matters).
+    """
+    parts = urlsplit(url)
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)), safe=",")
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path or "/", query, ""))
+
+def next_boundary(now: float, period: float = TTL_BOUNDARY) -> float:
+    """
+    First multiple of period (seconds since the epoch) after now.
+    """
+    return (now // period + 1) * period
+
+class ResponseCache:
+    """
+    Persistent HTTP response cache in one SQLite file.
+
+    Entries are fresh until the next hour boundary. Stale entries are kept and
+    revalidated with If-None-Match / If-Modified-Since, so an unchanged forecast
+    costs a 304 instead of a full download. When the stored bodies exceed
+    max_bytes, the least recently used entries are evicted.
+
+    Safe to share between the fetch threads (one connection behind a lock).
+    """
+
+    def __init__(self, path: Path, max_bytes: int = DEFAULT_MAX_BYTES, clock=time.time):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        self.max_bytes = max_bytes
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.executescript(SCHEMA)
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+    def lookup(self, url: str):
+        """
+        Cached entry of url as (body, etag, last_modified, fresh), or None.
+        """
+        key = normalize_url(url)
+        now = self.clock()
+        with self._lock:
+            row = self._db.execute(
+                "SELECT body, etag, last_modified, expires_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._db.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+            self._db.commit()
+
+        body, etag, last_modified, expires_at = row
+        return body, etag, last_modified, now < expires_at
+
+    def store(self, url: str, body: bytes, etag: str | None = None, last_modified: str | None = None):
+        """
+        Save a full response and evict old entries past max_bytes.
+        """
+        now = self.clock()
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (normalize_url(url), body, etag, last_modified, next_boundary(now), now, len(body)),
+            )
+            self._evict()
+            self._db.commit()
+
+    def refresh(self, url: str):
+        """
+        Mark an entry fresh again after a 304 Not Modified.
+        """
+        now = self.clock()
+        with self._lock:
+            self._db.execute(
+                "UPDATE responses SET expires_at = ?, accessed_at = ? WHERE key = ?",
+                (next_boundary(now), now, normalize_url(url)),
+            )
+            self._db.commit()
+
+    def _evict(self):
+        total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        # walk entries oldest access first until enough bytes are freed
+        excess = total - self.max_bytes
+        doomed = []
+        for key, size in self._db.execute("SELECT key, size FROM responses ORDER BY accessed_at"):
+            if excess <= 0:
+                break
+            doomed.append((key,))
+            excess -= size
+        self._db.executemany("DELETE FROM responses WHERE key = ?", doomed)
@@ -0,0 +1,107 @@
+import re
+import sqlite3
+from pathlib import Path
+
+import pandas as pd
+
+# variables become table names, so only plain identifiers are accepted
+_VARIABLE_NAME = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+def _table(variable: str) -> str:
+    if not _VARIABLE_NAME.match(variable):
+        raise ValueError(f"invalid variable name {variable!r}")
+    return f'"{variable}"'
+
+def _to_epoch(times: pd.Series) -> list[int]:
+    """
+    Naive UTC timestamps -> integer seconds since the epoch.
+    """
+    return ((times - pd.Timestamp(0)) // pd.Timedelta(seconds=1)).tolist()
+
+class TimeSeriesStore:
+    """
+    Incremental history of hourly values in one SQLite file, one table per variable.
+
+    Rows are (city, time, value) with (city, time) as the primary key, stored
+    clustered on it (WITHOUT ROWID). Each run upserts what it fetched: new hours
+    are added and overlapping hours take the latest value, so history grows
+    beyond the API's past_days window. Reads by city and time range are a
+    single index range scan.
+    """
+
+    def __init__(self, path: Path):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(path)
+        self._db.execute("PRAGMA journal_mode=WAL")
+
+    def close(self):
+        self._db.close()
+
+    def _ensure_table(self, variable: str):
+        self._db.execute(
+            f"CREATE TABLE IF NOT EXISTS {_table(variable)} ("
+            "city TEXT NOT NULL, time INTEGER NOT NULL, value REAL, "
+            "PRIMARY KEY (city, time)) WITHOUT ROWID"
+        )
+
+    def append(self, city: str, df: pd.DataFrame, variables: list[str]) -> int:
+        """
+        Upsert the rows of df (a 'time' column plus one column per variable).
+
+        Returns the number of hours that were not stored yet.
+        """
+        times = _to_epoch(df["time"])
+        if not times:
+            return 0
+
+        new = 0
+        with self._db:
+            for var in variables:
+                self._ensure_table(var)
+                table = _table(var)
+
+                before = self._db.execute(f"SELECT COUNT(*) FROM {table} WHERE city = ?", (city,)).fetchone()[0]
+                self._db.executemany(
+                    f"INSERT INTO {table} (city, time, value) VALUES (?, ?, ?) "
+                    "ON CONFLICT (city, time) DO UPDATE SET value = excluded.value",
+                    zip([city] * len(times), times, df[var].tolist()),
+                )
+                after = self._db.execute(f"SELECT COUNT(*) FROM {table} WHERE city = ?", (city,)).fetchone()[0]
+                new = max(new, after - before)
+        return new
+
+    def read(self, city: str, variables: list[str], start=None, end=None) -> pd.DataFrame:
+        """
+        Stored history of one city as a DataFrame with 'time' and one column per variable.
+
+        start / end (anything pd.Timestamp accepts, inclusive) limit the time range.
+        """
+        query = "SELECT time, value FROM {} WHERE city = ?"
+        params = [city]
+        if start is not None:
+            query += " AND time >= ?"
+            params.append(_to_epoch(pd.Series([pd.Timestamp(start)]))[0])
+        if end is not None:
+            query += " AND time <= ?"
+            params.append(_to_epoch(pd.Series([pd.Timestamp(end)]))[0])
+        query += " ORDER BY time"
+
+        columns = []
+        for var in variables:
+            self._ensure_table(var)
+            rows = self._db.execute(query.format(_table(var)), params).fetchall()
+            times, values = zip(*rows) if rows else ((), ())
+            columns.append(pd.Series(values, index=pd.Index(times, dtype="int64"), name=var, dtype=float))
+
+        df = pd.concat(columns, axis=1).sort_index() if columns else pd.DataFrame()
+        df.index = pd.to_datetime(df.index, unit="s")
+        df = df.rename_axis("time").reset_index()
+        return df
+
+    def cities(self, variable: str) -> list[str]:
+        """
+        Cities with stored history of a variable.
+        """
+        self._ensure_table(variable)
+        return [row[0] for row in self._db.execute(f"SELECT DISTINCT city FROM {_table(variable)} ORDER BY city")]
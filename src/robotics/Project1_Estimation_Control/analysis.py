@@ -0,0 +1,258 @@
+# Responsibility - Judge PID + Plant configurations analytically (no time-domain simulation)
+
+import numpy as np
+
+from plant import zoh_coefficients
+
+# Closed loop of PIDController (fed the true state) and Plant, per timestep:
+#     I_k+1 = I_k + dt (r - x_k)
+#     u_k   = kp (r - x_k) + ki I_k+1 - kd v_k
+#     [x, v]_k+1 = Phi [x, v]_k + Gamma (u_k + d)
+# which is linear in s = [x, v, I]:  s_k+1 = A s_k + b_r r + b_d d.
+# Phi / Gamma depend on the plant scheme (see PlantBank); every function here
+# takes gains as an (N, 3) array of (kp, ki, kd) and works on all N at once
+# (damping may be a scalar or one value per gain set).
+
+def plant_discretization(damping, dt, scheme="euler"):
+    """
+    Discrete plant [x, v]_k+1 = Phi [x, v]_k + Gamma w for the PlantBank schemes.
+
+    Returns ((phi00, phi01, phi10, phi11), (gamma0, gamma1)).
+    """
+    c = np.asarray(damping, dtype=float)
+
+    if scheme == "euler":
+        # semi-implicit Euler: v first, then x with the new v
+        a = 1.0 - c * dt
+        return (1.0, dt * a, 0.0, a), (dt**2, dt)
+
+    if scheme == "exact":
+        e, g1, g2 = zoh_coefficients(c, dt)
+        return (1.0, g1, 0.0, e), (g2, g1)
+
+    if scheme == "rk4":
+        # for a linear system with held input RK4 is the 4th-order Taylor polynomial of exp(M dt)
+        # M = [[0, 1], [0, -c]] -> M^j = [[0, (-c)^(j-1)], [0, (-c)^j]] for j >= 1
+        h = -c * dt
+        t1 = 1.0 + h / 2.0 + h**2 / 6.0 + h**3 / 24.0       # sum h^(j-1) / j!, j = 1..4
+        t2 = 0.5 + h / 6.0 + h**2 / 24.0                      # sum h^(j-2) / j!, j = 2..4 (input integral)
+        phi11 = 1.0 + h * t1
+        return (1.0, dt * t1, 0.0, phi11), (dt**2 * t2, dt * t1)
+
+    raise ValueError(f"unknown scheme {scheme!r} (expected 'euler', 'rk4' or 'exact')")
+
+def closed_loop_matrix(gains, dt, damping=0.5, scheme="euler"):
+    """
+    Closed-loop state matrix and input vectors.
+
+    Returns A (N, 3, 3), b_r (N, 3) for the target and b_d (N, 3) for the disturbance.
+    """
+    gains = np.atleast_2d(np.asarray(gains, dtype=float))
+    kp, ki, kd = gains[:, 0], gains[:, 1], gains[:, 2]
+    n = gains.shape[0]
+
+    (p00, p01, p10, p11), (g0, g1) = plant_discretization(damping, dt, scheme)
+
+    # u = -K x - kd v + ki I + K r   with K = kp + ki dt (the integral already includes this step's error)
+    K = kp + ki * dt
+
+    A = np.zeros((n, 3, 3))
+    A[:, 0, 0] = p00 - g0 * K
+    A[:, 0, 1] = p01 - g0 * kd
+    A[:, 0, 2] = g0 * ki
+    A[:, 1, 0] = p10 - g1 * K
+    A[:, 1, 1] = p11 - g1 * kd
+    A[:, 1, 2] = g1 * ki
+    A[:, 2, 0] = -dt
+    A[:, 2, 2] = 1.0
+
+    b_r = np.stack([g0 * K, g1 * K, np.full(n, dt)], axis=1)
+    b_d = np.zeros((n, 3))
+    b_d[:, 0] = g0
+    b_d[:, 1] = g1
+
+    return A, b_r, b_d
+
+def poles(gains, dt, damping=0.5, scheme="euler"):
+    """
+    Closed-loop poles (N, 3), complex.
+    """
+    A, _, _ = closed_loop_matrix(gains, dt, damping, scheme)
+    return np.linalg.eigvals(A)
+
+def loop_poles(gains, dt, damping=0.5, scheme="euler"):
+    """
+    Closed-loop poles that shape the response (N, 3), complex.
+
+    With ki = 0 the integral state never feeds back (its column of A is [0, 0, 1]),
+    so its pole sits at exactly 1 without making the loop unstable. That pole is
+    NaN here and the other two come from the [x, v] block alone.
+    """
+    gains = np.atleast_2d(np.asarray(gains, dtype=float))
+    A, _, _ = closed_loop_matrix(gains, dt, damping, scheme)
+    z = np.linalg.eigvals(A).astype(complex)
+
+    no_integral = gains[:, 1] == 0.0
+    if no_integral.any():
+        z[no_integral, :2] = np.linalg.eigvals(A[no_integral, :2, :2])
+        z[no_integral, 2] = np.nan
+    return z
+
+def damping_ratio(z_poles, dt):
+    """
+    Damping ratio of each discrete pole through s = ln(z) / dt (1 for real positive poles).
+    """
+    s = np.log(z_poles.astype(complex)) / dt
+    mag = np.abs(s)
+    return np.where(mag > 0, -s.real / np.where(mag > 0, mag, 1.0), 1.0)
+
+def loop_response(gains, dt, damping=0.5, scheme="euler", n_freq=512):
+    """
+    Loop transfer L(z) with the loop broken at the plant input, on z = exp(j w dt).
+
+    Controller seen from the plant: u = -(K + ki dt / (z - 1)) x - kd v, so
+    L(z) = (K + ki dt / (z - 1)) Px(z) + kd Pv(z) and the closed loop is 1 + L(z) = 0.
+    Returns (w (F,), L (N, F)) on a log-spaced grid up to the Nyquist frequency.
+    """
+    gains = np.atleast_2d(np.asarray(gains, dtype=float))
+    kp, ki, kd = (g[:, None] for g in gains.T)
+    K = kp + ki * dt
+
+    # plant coefficients as columns so a per-gain-set damping broadcasts over frequency
+    phi, gamma = plant_discretization(damping, dt, scheme)
+    p00, p01, p10, p11, g0, g1 = (np.reshape(np.asarray(c, dtype=float), (-1, 1)) for c in (*phi, *gamma))
+
+    w = np.logspace(-4, 0, n_freq) * (np.pi / dt)
+    z = np.exp(1j * w * dt)
+
+    # the grid ends exactly at Nyquist, where L is real (see stability_margins)
+    z[-1] = -1.0
+    z = z[None, :]
+
+    # (zI - Phi)^-1 Gamma for the 2x2 plant (phi10 = 0)
+    det = (z - p00) * (z - p11)
+    Px = ((z - p11) * g0 + p01 * g1) / det
+    Pv = (p10 * g0 + (z - p00) * g1) / det
+
+    L = (K + ki * dt / (z - 1.0)) * Px + kd * Pv
+    return w, L
+
+def stability_margins(gains, dt, damping=0.5, scheme="euler", n_freq=512):
+    """
+    Gain and phase margins from L(e^jw) on a frequency grid.
+
+    gain_margin_db:   smallest |20 log10 |L|| over the phase crossovers (phase = -180 deg mod 360,
+                      including a phase that only reaches -180 deg at the Nyquist frequency),
+                      signed: positive = gain may grow by that much, negative = must not shrink
+    phase_margin_deg: smallest distance of the phase from -180 deg at the gain crossovers (|L| = 1)
+    NaN where there is no crossover on the grid.
+    """
+    w, L = loop_response(gains, dt, damping, scheme, n_freq)
+
+    mag_db = 20.0 * np.log10(np.abs(L))
+    phase = np.degrees(np.unwrap(np.angle(L), axis=1))
+
+    # at Nyquist (z = -1) L is real: a negative L(-1) means the phase reaches -180 deg there.
+    # A discrete loop often only touches -180 deg at that endpoint, which the sign
+    # change test below cannot see, so the endpoint is a crossover of its own.
+    L_nyquist = L[:, -1].real
+    nyquist_cross = L_nyquist < 0.0
+    gm_nyquist = np.where(nyquist_cross, -20.0 * np.log10(np.abs(L_nyquist)), np.nan)
+
+    # phase crossovers: phase passes an odd multiple of -180 deg between two grid points
+    # (the last interval only when the endpoint is not already the crossover)
+    branch = np.floor((phase + 180.0) / 360.0)
+    phase_cross = branch[:, 1:] != branch[:, :-1]
+    phase_cross[:, -1] &= ~nyquist_cross
+    # |L| at the crossing, interpolated linearly in phase between the two grid points
+    cross_phase = 360.0 * np.maximum(branch[:, 1:], branch[:, :-1]) - 180.0
+    step = phase[:, 1:] - phase[:, :-1]
+    frac = np.clip((cross_phase - phase[:, :-1]) / np.where(step != 0.0, step, 1.0), 0.0, 1.0)
+    gm_cross = -(mag_db[:, :-1] + frac * (mag_db[:, 1:] - mag_db[:, :-1]))
+    gm = np.where(phase_cross, gm_cross, np.nan)
+    gm = np.concatenate([gm, gm_nyquist[:, None]], axis=1)
+    gain_margin = _nan_pick(gm, np.abs(gm))
+
+    # gain crossovers: |L| passes 1
+    gain_cross = np.signbit(mag_db[:, 1:]) != np.signbit(mag_db[:, :-1])
+    pm = (0.5 * (phase[:, 1:] + phase[:, :-1]) + 180.0 + 180.0) % 360.0 - 180.0
+    pm = np.where(gain_cross, pm, np.nan)
+    phase_margin = _nan_pick(pm, np.abs(pm))
+
+    return gain_margin, phase_margin
+
+def _nan_pick(values, key):
+    """
+    Per row, the value with the smallest key (NaN entries ignored); NaN for all-NaN rows.
+    """
+    key = np.where(np.isnan(key), np.inf, key)
+    i = np.argmin(key, axis=1)
+    picked = values[np.arange(values.shape[0]), i]
+    return np.where(np.isinf(key.min(axis=1)), np.nan, picked)
+
+def analyze(gains, dt, damping=0.5, scheme="euler", n_freq=512):
+    """
+    Poles, stability and margins for every gain set.
+
+    Returns a dict of (N,) arrays (poles is (N, 3)):
+    poles, spectral_radius, stable, min_damping_ratio, gain_margin_db, phase_margin_deg.
+    Stability and damping ignore the decoupled integrator pole of ki = 0 (see loop_poles).
+    """
+    z = poles(gains, dt, damping, scheme)
+    active = loop_poles(gains, dt, damping, scheme)
+    radius = np.nanmax(np.abs(active), axis=1)
+    gm, pm = stability_margins(gains, dt, damping, scheme, n_freq)
+
+    return {
+        "poles": z,
+        "spectral_radius": radius,
+        "stable": radius < 1.0,
+        "min_damping_ratio": np.nanmin(damping_ratio(active, dt), axis=1),
+        "gain_margin_db": gm,
+        "phase_margin_deg": pm,
+    }
+
+def screen(gains, dt, damping=0.5, scheme="euler", min_damping_ratio=0.0, max_radius=1.0):
+    """
+    Boolean mask of gain sets worth simulating: stable (spectral radius < max_radius)
+    and with every pole at least min_damping_ratio damped.
+    PD candidates (ki = 0) are judged on their [x, v] poles (see loop_poles).
+    """
+    z = loop_poles(gains, dt, damping, scheme)
+    ok = np.nanmax(np.abs(z), axis=1) < max_radius
+    if min_damping_ratio > 0.0:
+        ok &= np.nanmin(damping_ratio(z, dt), axis=1) >= min_damping_ratio
+    return ok
+
+def step_response(gains, steps, target=10.0, dt=0.1, damping=0.5, disturbance=-1.0,
+                  x0=0.0, v0=0.0, scheme="euler"):
+    """
+    Closed-form position response x_1..x_steps (N, steps) from the eigendecomposition of A.
+
+    s_k = A^k s_0 + (sum_j<k A^j) b  with  A = V diag(lam) V^-1, so each pole contributes
+    lam^k and (1 - lam^k) / (1 - lam) (k for lam = 1). Assumes A is diagonalizable
+    (repeated poles, e.g. exactly critical damping, make V ill-conditioned).
+    """
+    A, b_r, b_d = closed_loop_matrix(gains, dt, damping, scheme)
+    n = A.shape[0]
+
+    lam, V = np.linalg.eig(A)
+    V_inv = np.linalg.inv(V)
+
+    s0 = np.zeros((n, 3))
+    s0[:, 0] = x0
+    s0[:, 1] = v0
+    b = b_r * target + b_d * disturbance
+
+    # modal coordinates of the initial state and the constant input
+    c0 = np.einsum("nij,nj->ni", V_inv, s0)
+    cb = np.einsum("nij,nj->ni", V_inv, b)
+
+    k = np.arange(1, steps + 1)
+    lam_k = lam[:, :, None] ** k                                      # (N, 3, T)
+    one = np.abs(1.0 - lam) < 1e-12
+    denom = np.where(one, 1.0, 1.0 - lam)[:, :, None]
+    geom = np.where(one[:, :, None], k.astype(complex), (1.0 - lam_k) / denom)
+
+    modes = c0[:, :, None] * lam_k + cb[:, :, None] * geom            # (N, 3, T)
+    return np.einsum("ni,nit->nt", V[:, 0, :], modes).real
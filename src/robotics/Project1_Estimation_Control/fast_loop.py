@@ -0,0 +1,185 @@
+# Responsibility - Run the whole Plant -> Sensor -> Kalman -> PID loop in one call
+
+import numpy as np
+
+from plant import Plant
+from sensor import Sensor
+from kalman_filter import KalmanFilter
+from pid_controller import PIDController
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+def _closed_loop_kernel(steps, dt, u,
+                        x, v, damping, disturbance,
+                        noise, measurement_std,
+                        x_hat, v_hat, p00, p01, p10, p11,
+                        f00, f01, f10, f11, b0, b1, h0, h1,
+                        q00, q01, q10, q11, r,
+                        steady, k0_inf, k1_inf,
+                        target, kp, ki, kd, integral_error,
+                        true_positions, measured_positions, estimated_positions,
+                        estimated_velocities, control_inputs):
+    """
+    Fused closed loop on plain floats (2x2 matrices written out by hand).
+
+    Same math and step order as simulate.py; the filter model (F, B, H, Q, R) comes
+    from the KalmanFilter, dt only drives the plant and the controller. With steady
+    set, the correction uses the fixed gain (k0_inf, k1_inf) and P is left as is.
+    Compiled with Numba when available.
+    Returns the final (u, x, v, x_hat, v_hat, p00, p01, p10, p11, integral_error).
+    """
+    for k in range(steps):
+        # 1. Plant evolves using LAST control input
+        a = u - damping * v + disturbance
+        v += a * dt
+        x += v * dt
+
+        # 2. Sensor measures the true state
+        z = x + measurement_std * noise[k]
+
+        # 3. Kalman prediction: x = F x + B u
+        x0 = x_hat
+        x_hat = f00 * x0 + f01 * v_hat + b0 * u
+        v_hat = f10 * x0 + f11 * v_hat + b1 * u
+
+        # 4. Kalman correction with scalar innovation
+        y = z - (h0 * x_hat + h1 * v_hat)
+        if steady:
+            x_hat += k0_inf * y
+            v_hat += k1_inf * y
+        else:
+            # P = F P F^T + Q
+            fp00 = f00 * p00 + f01 * p10
+            fp01 = f00 * p01 + f01 * p11
+            fp10 = f10 * p00 + f11 * p10
+            fp11 = f10 * p01 + f11 * p11
+            n00 = fp00 * f00 + fp01 * f01 + q00
+            n01 = fp00 * f10 + fp01 * f11 + q01
+            n10 = fp10 * f00 + fp11 * f01 + q10
+            n11 = fp10 * f10 + fp11 * f11 + q11
+
+            # P H^T, H P, innovation covariance and gain
+            pht0 = n00 * h0 + n01 * h1
+            pht1 = n10 * h0 + n11 * h1
+            hp0 = h0 * n00 + h1 * n10
+            hp1 = h0 * n01 + h1 * n11
+            s = h0 * pht0 + h1 * pht1 + r
+            k0 = pht0 / s
+            k1 = pht1 / s
+
+            x_hat += k0 * y
+            v_hat += k1 * y
+
+            # P = (I - K H) P = P - K (H P)
+            p00 = n00 - k0 * hp0
+            p01 = n01 - k0 * hp1
+            p10 = n10 - k1 * hp0
+            p11 = n11 - k1 * hp1
+
+        # 6. Controller computes NEXT control input
+        error = target - x_hat
+        integral_error += error * dt
+        u = kp * error + ki * integral_error - kd * v_hat
+
+        true_positions[k] = x
+        measured_positions[k] = z
+        estimated_positions[k] = x_hat
+        estimated_velocities[k] = v_hat
+        control_inputs[k] = u
+
+    return u, x, v, x_hat, v_hat, p00, p01, p10, p11, integral_error
+
+if NUMBA_AVAILABLE:
+    _compiled_kernel = njit(cache=True)(_closed_loop_kernel)
+
+def run_closed_loop(plant: Plant, sensor: Sensor, kalman: KalmanFilter, controller: PIDController,
+                    steps: int, dt: float, u: float = 0.0, use_jit: bool | None = None):
+    """
+    Run the closed loop for `steps` steps and return the logs as arrays.
+
+    plant, sensor, kalman, controller: components, advanced in place
+    u: control input applied on the first step
+    use_jit: True -> compiled Numba kernel, False -> pure-Python classes,
+             None -> Numba if installed
+
+    Both backends consume the same sensor noise stream and leave the
+    components in the same final state. Returns a dict with
+    true_positions, measured_positions, estimated_positions,
+    estimated_velocities and control_inputs.
+    """
+    if use_jit is None:
+        use_jit = NUMBA_AVAILABLE
+    if use_jit and not NUMBA_AVAILABLE:
+        raise ImportError("use_jit=True needs numba (pip install numba)")
+    if kalman.H.shape != (1, 2):
+        raise ValueError("the fused loop needs a position-only (1x2 H) KalmanFilter")
+
+    logs = {name: np.empty(steps) for name in ("true_positions", "measured_positions", "estimated_positions",
+                                               "estimated_velocities", "control_inputs")}
+
+    if not use_jit:
+        return _run_python(plant, sensor, kalman, controller, steps, dt, u, logs)
+
+    noise = sensor.noise.take(steps)
+    P = kalman.P
+    Q = kalman.Q
+    f00, f01, f10, f11 = kalman.F.ravel().tolist()
+    b0, b1 = kalman.B.ravel().tolist()
+    h0, h1 = kalman.H.ravel().tolist()
+
+    # steady-state mode: run the filter's cached gain, like KalmanFilter.update does
+    steady = kalman._steady_active()
+    k0_inf, k1_inf = kalman._steady[6:8] if steady else (0.0, 0.0)
+
+    (u, plant.x, plant.v, x_hat, v_hat,
+     p00, p01, p10, p11, controller.integral_error) = _compiled_kernel(
+        steps, dt, float(u),
+        float(plant.x), float(plant.v), float(plant.damping), float(plant.disturbance),
+        noise, float(sensor.measurement_std),
+        float(kalman.x_hat[0, 0]), float(kalman.x_hat[1, 0]),
+        float(P[0, 0]), float(P[0, 1]), float(P[1, 0]), float(P[1, 1]),
+        f00, f01, f10, f11, b0, b1, h0, h1,
+        float(Q[0, 0]), float(Q[0, 1]), float(Q[1, 0]), float(Q[1, 1]), float(kalman.R[0, 0]),
+        steady, k0_inf, k1_inf,
+        float(controller.target), float(controller.kp), float(controller.ki), float(controller.kd),
+        float(controller.integral_error),
+        logs["true_positions"], logs["measured_positions"], logs["estimated_positions"],
+        logs["estimated_velocities"], logs["control_inputs"])
+
+    # write the final state back so the objects can keep running either way
+    kalman.x_hat = np.array([[x_hat], [v_hat]])
+    kalman.P = np.array([[p00, p01], [p10, p11]])
+
+    return logs
+
+def _run_python(plant, sensor, kalman, controller, steps, dt, u, logs):
+    """
+    Fallback: the same loop as simulate.py using the component classes.
+    """
+    true_positions = logs["true_positions"]
+    measured_positions = logs["measured_positions"]
+    estimated_positions = logs["estimated_positions"]
+    estimated_velocities = logs["estimated_velocities"]
+    control_inputs = logs["control_inputs"]
+
+    for k in range(steps):
+        x_true, v_true = plant.step(u, dt)
+        z = sensor.measure(x_true)
+
+        kalman.predict(u)
+        kalman.update(z)
+
+        x_hat, v_hat = kalman.get_state()
+        u = controller.compute(x_hat, v_hat, dt)
+
+        true_positions[k] = x_true
+        measured_positions[k] = z
+        estimated_positions[k] = x_hat
+        estimated_velocities[k] = v_hat
+        control_inputs[k] = u
+
+    return logs
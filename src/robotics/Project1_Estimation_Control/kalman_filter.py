@@ -1,7 +1,14 @@
 # Responsibility: Estimate position and velocity from noisy measurement
 
+import sys
+from pathlib import Path
+
 import numpy as np
 
+# helpers shared with the other projects live in src/robotics/robotics_common
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from robotics_common.riccati import solve_dare
+
 class KalmanFilter:
     def __init__(self, dt, process_var = 1.0, measurement_var = 1.0):
         """
@@ -44,11 +51,78 @@ class KalmanFilter:
         # Identity matrix
         self.I = np.eye(2)
 
+        # Steady-state mode (see enable_steady_state), None = full Kalman recursion
+        self._steady = None
+
+    def enable_steady_state(self, tol = 1e-12, max_iter = 100_000):
+        """
+        Switch to a precomputed steady-state gain.
+
+        F, B, H, Q and R are constant, so P converges to the fixed point of the
+        discrete algebraic Riccati equation. Solve it once and cache K_inf; from
+        then on predict/update only move the state and P stays at P_inf.
+
+        tol: convergence tolerance of the Riccati iteration
+        max_iter: iteration limit
+
+        Reassigning F, B, H, Q or R switches back to the full recursion; while
+        the mode is on those arrays are read-only.
+        """
+
+        if self.H.shape[0] != 1:
+            raise ValueError("steady-state mode needs a scalar (single-row H) measurement")
+
+        P_pred, K = solve_dare(self.F, self.H, self.Q, self.R, self.P, tol, max_iter)
+
+        # filter now sits at its steady-state (posterior) covariance
+        self.P = (self.I - K @ self.H) @ P_pred
+
+        sources = (self.F, self.B, self.H, self.Q, self.R)
+        for array in sources:
+            array.flags.writeable = False
+
+        self._steady = (*self.F.ravel().tolist(), *self.B.ravel().tolist(),
+                        *K.ravel().tolist(), *self.H.ravel().tolist(), sources)
+
+    def disable_steady_state(self):
+        """
+        Go back to the full predict/update recursion.
+        """
+
+        if self._steady is not None:
+            for array in self._steady[-1]:
+                array.flags.writeable = True
+        self._steady = None
+
+    def _steady_active(self):
+        """
+        True while steady-state mode is on and the model arrays are the ones it was solved for.
+        """
+
+        if self._steady is None:
+            return False
+
+        F, B, H, Q, R = self._steady[-1]
+        if self.F is F and self.B is B and self.H is H and self.Q is Q and self.R is R:
+            return True
+
+        # parameters changed -> cached gain is stale
+        self.disable_steady_state()
+        return False
+
     def predict(self, u):
         """
         Prediction step (model-based)
         """
 
+        if self._steady_active():
+            # x = F x + B u with cached entries, P stays at P_inf
+            f00, f01, f10, f11, b0, b1 = self._steady[:6]
+            x0, x1 = self.x_hat.ravel().tolist()
+            self.x_hat[0, 0] = f00 * x0 + f01 * x1 + b0 * u
+            self.x_hat[1, 0] = f10 * x0 + f11 * x1 + b1 * u
+            return
+
         # peredict state
         self.x_hat = self.F @ self.x_hat + self.B * u
 
@@ -60,6 +134,20 @@ class KalmanFilter:
         Correction step (measurement-based)
         """
 
+        if self._steady_active():
+            # x = x + K_inf (z - H x)
+            k0, k1, h0, h1 = self._steady[6:10]
+            x0, x1 = self.x_hat.ravel().tolist()
+            y = _scalar(z) - (h0 * x0 + h1 * x1)
+            self.x_hat[0, 0] = x0 + k0 * y
+            self.x_hat[1, 0] = x1 + k1 * y
+            return
+
+        # single-row H (position only): closed-form scalar update, no matrix inverse
+        if self.H.shape[0] == 1:
+            self._update_scalar(z)
+            return
+
         # innovation (measurement residual)
         y = z - (self.H @ self.x_hat)
 
@@ -75,9 +163,51 @@ class KalmanFilter:
         # Updayte uncertainty
         self.P = (self.I - K @ self.H) @ self.P
 
+    def _update_scalar(self, z):
+        """
+        Correction step for a scalar measurement, on plain floats.
+
+        Same math as the matrix path (S is 1x1, so S^-1 = 1/S); x_hat and P are updated in place.
+        """
+
+        h0, h1 = self.H.ravel().tolist()
+        p00, p01, p10, p11 = self.P.ravel().tolist()
+        x0, x1 = self.x_hat.ravel().tolist()
+
+        # P H^T and H P
+        pht0 = p00 * h0 + p01 * h1
+        pht1 = p10 * h0 + p11 * h1
+        hp0 = h0 * p00 + h1 * p10
+        hp1 = h0 * p01 + h1 * p11
+
+        # innovation covariance and Kalman gain
+        S = h0 * pht0 + h1 * pht1 + self.R.item()
+        k0 = pht0 / S
+        k1 = pht1 / S
+
+        # innovation (measurement residual); z may be a float or a 1 / 1x1 array
+        y = _scalar(z) - (h0 * x0 + h1 * x1)
+
+        # Update state estimate
+        self.x_hat[0, 0] = x0 + k0 * y
+        self.x_hat[1, 0] = x1 + k1 * y
+
+        # Update uncertainty: P = (I - K H) P = P - K (H P)
+        P = self.P
+        P[0, 0] = p00 - k0 * hp0
+        P[0, 1] = p01 - k0 * hp1
+        P[1, 0] = p10 - k1 * hp0
+        P[1, 1] = p11 - k1 * hp1
+
     def get_state(self):
         """
         Return estimated position and velocity
         """
 
-        return self.x_hat[0, 0], self.x_hat[1, 0]
\ No newline at end of file
+        return self.x_hat[0, 0], self.x_hat[1, 0]
+
+def _scalar(z):
+    """
+    Scalar measurement as a float (accepts floats and 1 / 1x1 arrays, like the matrix path).
+    """
+    return float(np.asarray(z).reshape(-1)[0])
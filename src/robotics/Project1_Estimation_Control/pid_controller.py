@@ -1,4 +1,5 @@
 # Responsibility - Compute control input to reach the target
+import numpy as np
 
 class PIDController:
     def __init__(self, 
@@ -41,4 +42,94 @@ class PIDController:
         # input (force/acceleration) = proportional term + integral term + derivative term (damping)
         u = self.kp * error + self.ki * self.integral_error - self.kd * v_hat
 
-        return u
\ No newline at end of file
+        return u
+
+class PIDBank:
+    """
+    N PIDControllers stored as arrays: gains, targets and integrator states are shape (N,).
+
+    compute() runs the same control law as PIDController.compute for every loop
+    in one vectorized call, then clamps the output to [u_min, u_max].
+
+    Anti-windup (back-calculation): while an output is clamped, the integrator
+    is bled back by kaw * (u_clamped - u) * dt, so it stops growing once the
+    actuator saturates. kaw defaults to 1 / kp (tracking time = Ti = kp / ki).
+    Unclamped loops get exactly the PIDController result.
+    """
+
+    def __init__(self, n, target, kp=1.0, ki=0.0, kd=0.5, u_min=-np.inf, u_max=np.inf, kaw=None):
+        self.n = n
+
+        # scalars broadcast to every loop, arrays give per-loop values
+        self.target = _per_loop(target, n)
+        self.kp = _per_loop(kp, n)
+        self.ki = _per_loop(ki, n)
+        self.kd = _per_loop(kd, n)
+
+        # actuator limits
+        self.u_min = _per_loop(u_min, n)
+        self.u_max = _per_loop(u_max, n)
+
+        # back-calculation gain (0 = no anti-windup, integrator only clamps the output)
+        if kaw is None:
+            with np.errstate(divide="ignore"):
+                kaw = np.where(self.kp != 0.0, 1.0 / self.kp, 0.0)
+        self.kaw = _per_loop(kaw, n)
+
+        self.integral_error = np.zeros(n)
+        self.saturated = np.zeros(n, dtype=bool)
+
+    @classmethod
+    def from_controllers(cls, controllers, u_min=-np.inf, u_max=np.inf, kaw=None):
+        """
+        Build a bank from existing PIDController objects (integrator state is copied).
+        """
+        bank = cls(len(controllers),
+                   target=[c.target for c in controllers],
+                   kp=[c.kp for c in controllers],
+                   ki=[c.ki for c in controllers],
+                   kd=[c.kd for c in controllers],
+                   u_min=u_min, u_max=u_max, kaw=kaw)
+        bank.integral_error[:] = [c.integral_error for c in controllers]
+        return bank
+
+    def compute(self, x_hat, v_hat, dt):
+        """
+        Compute all control inputs from the estimated states.
+
+        x_hat, v_hat: estimated positions / velocities, shape (N,)
+        dt: timestep
+        Returns the clamped control inputs, shape (N,).
+        """
+        # position error
+        error = self.target - x_hat
+
+        # integral of error
+        self.integral_error += error * dt
+
+        # PID control law, then actuator limits
+        u = self.kp * error + self.ki * self.integral_error - self.kd * v_hat
+        u_sat = np.clip(u, self.u_min, self.u_max)
+
+        # back-calculation: bleed the integrator by the part of u the actuator could not deliver
+        # (u_sat - u is exactly 0.0 for unclamped loops)
+        self.saturated = u_sat != u
+        self.integral_error += self.kaw * (u_sat - u) * dt
+
+        return u_sat
+
+    def reset(self, mask=None):
+        """
+        Clear the integrators (all loops, or only where mask is True).
+        """
+        if mask is None:
+            self.integral_error[:] = 0.0
+        else:
+            self.integral_error[mask] = 0.0
+
+
+def _per_loop(value, n):
+    """
+    Copy a scalar or per-loop value into a float array of shape (n,).
+    """
+    return np.array(np.broadcast_to(np.asarray(value, dtype=float), (n,)))
@@ -1,4 +1,13 @@
 # Responsibility - Simulate the true system (what the robot is actually doing)
+import sys
+from pathlib import Path
+
+import numpy as np
+
+# helpers shared with the other projects live in src/robotics/robotics_common
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from robotics_common.discretization import zoh_coefficients, per_plant as _per_plant
+
 class Plant:
     def __init__(self, x0 = 0.0, v0 = 0.0, damping = 0.5, disturbance = -1.0):
         """
@@ -33,4 +42,98 @@ class Plant:
         # integrate velocity -> position
         self.x += self.v * dt
 
-        return self.x, self.v
\ No newline at end of file
+        return self.x, self.v
+
+# integration schemes offered by PlantBank
+SCHEMES = ("euler", "rk4", "exact")
+
+class PlantBank:
+    """
+    N 1D plants stored as arrays x, v (N,) with per-plant damping and disturbance.
+
+    step(u, dt) advances all plants at once with the selected scheme:
+        "euler": semi-implicit Euler, exactly Plant.step
+        "rk4":   classic 4th-order Runge-Kutta
+        "exact": zero-order-hold discretization (u held over the step). The
+                 matrix exponential of [[0, 1], [0, -damping]] has a closed
+                 form, so its coefficients are computed once per dt and cached.
+                 Exact at any dt for piecewise-constant inputs.
+
+    damping is read-only while cached coefficients depend on it; assign a new
+    array (or scalar) to change it.
+    """
+
+    def __init__(self, n, x0=0.0, v0=0.0, damping=0.5, disturbance=-1.0, scheme="euler"):
+        if scheme not in SCHEMES:
+            raise ValueError(f"scheme must be one of {SCHEMES}, got {scheme!r}")
+
+        self.n = n
+        self.scheme = scheme
+
+        self.x = _per_plant(x0, n)
+        self.v = _per_plant(v0, n)
+        self.disturbance = _per_plant(disturbance, n)
+        self.damping = damping
+
+    @property
+    def damping(self):
+        return self._damping
+
+    @damping.setter
+    def damping(self, value):
+        self._damping = _per_plant(value, self.n)
+        self._damping.flags.writeable = False
+
+        # exact-scheme coefficients per dt
+        self._zoh = {}
+
+    def step(self, u, dt):
+        """
+        Advance every plant by one timestep.
+
+        u: control inputs, shape (N,) or scalar
+        dt: timestep
+        """
+        # total input (force / acceleration) held over the step
+        w = u + self.disturbance
+
+        if self.scheme == "euler":
+            # same operations as Plant.step
+            a = u - self.damping * self.v + self.disturbance
+            self.v += a * dt
+            self.x += self.v * dt
+        elif self.scheme == "rk4":
+            self._step_rk4(w, dt)
+        else:
+            self._step_exact(w, dt)
+
+        return self.x, self.v
+
+    def _step_rk4(self, w, dt):
+        c = self.damping
+        x, v = self.x, self.v
+
+        # x' = v, v' = w - c v
+        k1x, k1v = v, w - c * v
+        v2 = v + 0.5 * dt * k1v
+        k2x, k2v = v2, w - c * v2
+        v3 = v + 0.5 * dt * k2v
+        k3x, k3v = v3, w - c * v3
+        v4 = v + dt * k3v
+        k4x, k4v = v4, w - c * v4
+
+        self.x = x + dt / 6.0 * (k1x + 2.0 * k2x + 2.0 * k3x + k4x)
+        self.v = v + dt / 6.0 * (k1v + 2.0 * k2v + 2.0 * k3v + k4v)
+
+    def _step_exact(self, w, dt):
+        if dt not in self._zoh:
+            self._zoh[dt] = zoh_coefficients(self.damping, dt)
+        e, g1, g2 = self._zoh[dt]
+
+        # [x, v]_k+1 = [[1, g1], [0, e]] [x, v]_k + [g2, g1] w
+        x, v = self.x, self.v
+        self.x = x + g1 * v + g2 * w
+        self.v = e * v + g1 * w
+
+    def get_state(self):
+        return np.stack([self.x, self.v], axis=1)
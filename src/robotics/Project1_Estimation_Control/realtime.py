@@ -0,0 +1,214 @@
+# Responsibility - Run the estimation/control loop at a fixed wall-clock rate and check its deadlines
+
+import argparse
+import time
+from dataclasses import dataclass
+
+import numpy as np
+
+from plant import Plant
+from sensor import Sensor
+from kalman_filter import KalmanFilter
+from pid_controller import PIDController
+
+# one entry per timed stage of a tick, in execution order (same order as simulate.py)
+STAGES = ("plant", "sense", "predict", "update", "control")
+
+# final wait before a deadline is a busy-wait: time.sleep can wake up late by
+# tens of microseconds to milliseconds, which is a large fraction of a 1 ms period
+DEFAULT_SPIN_NS = 200_000
+
+@dataclass
+class RealTimeReport:
+    """
+    Timing record of one real-time run (all times in nanoseconds).
+
+    latencies:   (ticks, len(STAGES) + 1) duration of each stage per tick, last column = whole tick
+    wake_jitter: (ticks,) how late each tick started after its scheduled release time
+    overruns:    ticks whose work finished after their deadline
+    missed:      periods skipped entirely because an overrun ran past them
+    """
+    rate_hz: float
+    period_ns: int
+    latencies: np.ndarray
+    wake_jitter: np.ndarray
+    overruns: int
+    missed: int
+
+    @property
+    def ticks(self):
+        return self.latencies.shape[0]
+
+    def histogram(self, stage="total", bins_per_decade=10, lo_ns=100, hi_ns=1e9):
+        """
+        Latency histogram of one stage on log-spaced bins.
+
+        Returns (counts, edges_ns). Durations outside [lo_ns, hi_ns] land in the first / last bin.
+        """
+        column = len(STAGES) if stage == "total" else STAGES.index(stage)
+        decades = np.log10(hi_ns) - np.log10(lo_ns)
+        edges = np.logspace(np.log10(lo_ns), np.log10(hi_ns), int(decades * bins_per_decade) + 1)
+        values = np.clip(self.latencies[:, column], edges[0], edges[-1])
+        counts, _ = np.histogram(values, bins=edges)
+        return counts, edges
+
+    def summary(self):
+        """
+        p50 / p99 / max latency per stage in microseconds, plus overrun counts.
+        """
+        stats = {}
+        for i, stage in enumerate(STAGES + ("total",)):
+            values = self.latencies[:, i] / 1e3
+            stats[stage] = {
+                "p50_us": float(np.percentile(values, 50)),
+                "p99_us": float(np.percentile(values, 99)),
+                "max_us": float(values.max()),
+            }
+        stats["wake_jitter"] = {
+            "p50_us": float(np.percentile(self.wake_jitter, 50) / 1e3),
+            "p99_us": float(np.percentile(self.wake_jitter, 99) / 1e3),
+            "max_us": float(self.wake_jitter.max() / 1e3),
+        }
+        stats["overruns"] = self.overruns
+        stats["missed"] = self.missed
+        return stats
+
+class RealTimeRunner:
+    """
+    Ticks Plant -> Sensor -> Kalman -> PID at a fixed wall-clock rate.
+
+    Deadlines are absolute (start + k * period on a monotonic clock), so a late
+    tick does not push every later tick back: the schedule never drifts. A tick
+    whose work ends after its deadline counts as an overrun; if it ran past
+    whole periods, those are counted as missed and the loop resumes on the next
+    period boundary instead of bursting to catch up.
+
+    The Plant stands in for the real hardware; every stage is timed separately.
+    """
+
+    def __init__(self, plant, sensor, kalman, controller, rate_hz=1000.0, dt=None,
+                 clock=time.perf_counter_ns, spin_ns=DEFAULT_SPIN_NS):
+        self.plant = plant
+        self.sensor = sensor
+        self.kalman = kalman
+        self.controller = controller
+
+        self.rate_hz = rate_hz
+        self.period_ns = int(round(1e9 / rate_hz))
+
+        # model timestep defaults to the real period
+        self.dt = self.period_ns / 1e9 if dt is None else dt
+
+        self.clock = clock
+        self.spin_ns = spin_ns
+
+        self.u = 0.0
+
+    def run(self, steps=None, duration=None):
+        """
+        Run for `steps` ticks (or `duration` seconds of wall-clock time) and return a RealTimeReport.
+        """
+        if steps is None:
+            if duration is None:
+                raise ValueError("give steps or duration")
+            steps = int(round(duration * self.rate_hz))
+
+        clock = self.clock
+        period = self.period_ns
+        dt = self.dt
+        plant, sensor, kalman, controller = self.plant, self.sensor, self.kalman, self.controller
+
+        latencies = np.zeros((steps, len(STAGES) + 1), dtype=np.int64)
+        jitter = np.zeros(steps, dtype=np.int64)
+        lat = memoryview(latencies.reshape(-1))
+        stride = len(STAGES) + 1
+
+        overruns = 0
+        missed = 0
+        u = self.u
+
+        start = clock()
+        release = start
+        for k in range(steps):
+            t0 = clock()
+            jitter[k] = t0 - release
+            deadline = release + period
+
+            # 1. Plant evolves using LAST control input
+            x_true, v_true = plant.step(u, dt)
+            t1 = clock()
+
+            # 2. Sensor measures the true state
+            z = sensor.measure(x_true)
+            t2 = clock()
+
+            # 3. / 4. Kalman prediction and correction
+            kalman.predict(u)
+            t3 = clock()
+            kalman.update(z)
+            t4 = clock()
+
+            # 5. Controller computes NEXT control input
+            x_hat, v_hat = kalman.get_state()
+            u = controller.compute(x_hat, v_hat, dt)
+            t5 = clock()
+
+            i = k * stride
+            lat[i] = t1 - t0
+            lat[i + 1] = t2 - t1
+            lat[i + 2] = t3 - t2
+            lat[i + 3] = t4 - t3
+            lat[i + 4] = t5 - t4
+            lat[i + 5] = t5 - t0
+
+            # next release on the absolute grid
+            if t5 > deadline:
+                overruns += 1
+                behind = (t5 - deadline) // period
+                missed += behind
+                release = deadline + behind * period + period
+            else:
+                release = deadline
+
+            self._wait_until(release)
+
+        self.u = u
+        return RealTimeReport(self.rate_hz, period, latencies, jitter, overruns, missed)
+
+    def _wait_until(self, target_ns):
+        """
+        Sleep most of the remaining time, then spin on the clock for the last spin_ns.
+        """
+        clock = self.clock
+        remaining = target_ns - clock()
+        if remaining > self.spin_ns:
+            time.sleep((remaining - self.spin_ns) / 1e9)
+        while clock() < target_ns:
+            pass
+
+def get_args():
+    p = argparse.ArgumentParser(description="Real-time run of the estimation/control loop")
+    p.add_argument("--rate", type=float, default=1000.0, help="Loop rate in Hz")
+    p.add_argument("--duration", type=float, default=5.0, help="Run time in seconds")
+    p.add_argument("--steady-state", action="store_true", help="Use the steady-state Kalman gain")
+    return p.parse_args()
+
+if __name__ == "__main__":
+    args = get_args()
+    dt = 1.0 / args.rate
+
+    kalman = KalmanFilter(dt=dt, process_var=3, measurement_var=0.8)
+    if args.steady_state:
+        kalman.enable_steady_state()
+
+    runner = RealTimeRunner(Plant(x0=0.0, v0=0.0, damping=0.5, disturbance=-1.0),
+                            Sensor(measurement_std=1.0),
+                            kalman,
+                            PIDController(target=10.0, kp=2, ki=0.3, kd=0.8),
+                            rate_hz=args.rate)
+    report = runner.run(duration=args.duration)
+
+    print(f"{report.ticks} ticks at {args.rate:g} Hz: {report.overruns} overruns, {report.missed} missed periods")
+    for stage, stats in report.summary().items():
+        if isinstance(stats, dict):
+            print(f"  {stage:12s} p50={stats['p50_us']:8.1f} us  p99={stats['p99_us']:8.1f} us  max={stats['max_us']:8.1f} us")
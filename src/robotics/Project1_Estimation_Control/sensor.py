@@ -1,16 +1,24 @@
 # Responsibility - Produce noisy measuremenets from the true system
 
-import numpy as np
+import sys
+from pathlib import Path
+
+# helpers shared with the other projects live in src/robotics/robotics_common
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from robotics_common.noise import NOISE_BLOCK_SIZE, NoiseBuffer
 
 class Sensor:
-    def __init__(self, measurement_std = 1.0):
+    def __init__(self, measurement_std = 1.0, rng = None, block_size = NOISE_BLOCK_SIZE):
         """
         Position sensor with Gaussian noise (normal distribution).
 
         measurement_std: standard deviation of measurement noise
+        rng: numpy.random.Generator for the noise stream (legacy global np.random stream if None)
+        block_size: noise samples pre-drawn per refill
         """
 
         self.measurement_std = measurement_std
+        self.noise = NoiseBuffer(rng, block_size)
 
     def measure(self, true_position):
         """
@@ -19,10 +27,9 @@ class Sensor:
         true_position: actual position from the plant
         """
 
-        noise = np.random.normal(0.0, self.measurement_std)
+        noise = self.measurement_std * self.noise.next()
 
         # z = the noisy measurement of position produced by the sensor.
         z = true_position + noise
 
         return z
-
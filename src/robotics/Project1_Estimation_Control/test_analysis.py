@@ -0,0 +1,25 @@
+# Run from this folder: python -m pytest -q
+
+import numpy as np
+import pytest
+
+from analysis import analyze, poles, stability_margins
+
+GAINS = np.array([[2.0, 0.3, 0.8],
+                  [1.0, 0.15, 0.5],
+                  [8.0, 1.0, 0.2]])
+
+@pytest.mark.parametrize("scheme", ["euler", "rk4", "exact"])
+def test_gain_margin_puts_a_pole_on_the_unit_circle(scheme):
+    # scaling every gain by the gain margin must make the loop marginally stable
+    gm, _ = stability_margins(GAINS, 0.1, scheme=scheme)
+    assert np.all(np.isfinite(gm))
+
+    radius = np.abs(poles(GAINS * 10.0 ** (gm[:, None] / 20.0), 0.1, scheme=scheme)).max(axis=1)
+    np.testing.assert_allclose(radius, 1.0, atol=1e-6)
+
+def test_stable_gains_report_a_positive_gain_margin():
+    result = analyze(GAINS, 0.1)
+    assert result["stable"].all()
+    assert np.all(result["gain_margin_db"] > 0.0)
+    np.testing.assert_allclose(result["gain_margin_db"], [26.7086, 30.9875, 30.2016], atol=1e-3)
@@ -0,0 +1,35 @@
+# Run from this folder: python -m pytest -q
+
+import numpy as np
+import pytest
+
+import fast_loop
+from plant import Plant
+from sensor import Sensor
+from kalman_filter import KalmanFilter
+from pid_controller import PIDController
+
+def build(kalman_dt, steady_state):
+    kalman = KalmanFilter(dt=kalman_dt, process_var=3, measurement_var=0.8)
+    if steady_state:
+        kalman.enable_steady_state()
+    return (Plant(x0=0.0, v0=0.0, damping=0.5, disturbance=-1.0),
+            Sensor(measurement_std=1.0, rng=np.random.default_rng(1)),
+            kalman,
+            PIDController(target=10.0, kp=2, ki=0.3, kd=0.8))
+
+@pytest.mark.parametrize("steady_state", [False, True])
+@pytest.mark.parametrize("kalman_dt", [0.1, 0.05])
+def test_fused_kernel_matches_component_loop(monkeypatch, kalman_dt, steady_state):
+    # the kernel runs uncompiled here, so this does not need numba
+    monkeypatch.setattr(fast_loop, "NUMBA_AVAILABLE", True)
+    monkeypatch.setattr(fast_loop, "_compiled_kernel", fast_loop._closed_loop_kernel, raising=False)
+
+    ref = build(kalman_dt, steady_state)
+    fused = build(kalman_dt, steady_state)
+    logs_ref = fast_loop.run_closed_loop(*ref, steps=500, dt=0.1, use_jit=False)
+    logs_fused = fast_loop.run_closed_loop(*fused, steps=500, dt=0.1, use_jit=True)
+
+    for name in logs_ref:
+        np.testing.assert_allclose(logs_fused[name], logs_ref[name], rtol=0, atol=1e-9)
+    np.testing.assert_allclose(fused[2].P, ref[2].P, rtol=0, atol=1e-12)
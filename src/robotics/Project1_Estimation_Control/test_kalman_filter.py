@@ -0,0 +1,36 @@
+# Run from this folder: python -m pytest -q
+
+import numpy as np
+import pytest
+
+from kalman_filter import KalmanFilter
+
+@pytest.mark.parametrize("steady_state", [False, True])
+@pytest.mark.parametrize("z", [1.0, np.array([1.0]), np.array([[1.0]])])
+def test_update_accepts_float_and_array_measurements(z, steady_state):
+    kf = KalmanFilter(0.1)
+    ref = KalmanFilter(0.1)
+    if steady_state:
+        kf.enable_steady_state()
+        ref.enable_steady_state()
+
+    for _ in range(3):
+        kf.predict(0.5)
+        kf.update(z)
+        ref.predict(0.5)
+        ref.update(1.0)
+
+    np.testing.assert_array_equal(kf.x_hat, ref.x_hat)
+    np.testing.assert_array_equal(kf.P, ref.P)
+
+def test_scalar_update_matches_matrix_update():
+    kf = KalmanFilter(0.1)
+    kf.predict(0.5)
+    P, x = kf.P.copy(), kf.x_hat.copy()
+
+    kf.update(np.array([[1.0]]))
+
+    S = kf.H @ P @ kf.H.T + kf.R
+    K = P @ kf.H.T @ np.linalg.inv(S)
+    np.testing.assert_allclose(kf.x_hat, x + K @ (np.array([[1.0]]) - kf.H @ x))
+    np.testing.assert_allclose(kf.P, (np.eye(2) - K @ kf.H) @ P)
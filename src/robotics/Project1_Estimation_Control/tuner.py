@@ -0,0 +1,300 @@
+# Responsibility - Search PID gains automatically against the Plant step response
+
+import argparse
+
+import numpy as np
+
+from pid_controller import PIDBank
+from plant import PlantBank
+from analysis import screen
+
+# default search box for (kp, ki, kd)
+DEFAULT_BOUNDS = ((0.0, 10.0), (0.0, 2.0), (0.0, 5.0))
+
+# cost = sum of weight * metric (rise time in s, overshoot in % of the step, ISE, effort)
+DEFAULT_WEIGHTS = {"rise_time": 1.0, "overshoot": 0.2, "ise": 0.02, "effort": 0.001}
+
+# cost given to candidates that never settle into a usable response
+FAILED_COST = 1e6
+
+# CMA-ES penalty per squared (normalized) distance outside the search box
+BOUND_PENALTY = 100.0
+
+def simulate_step_response(gains, target=10.0, dt=0.1, steps=1000,
+                           damping=0.5, disturbance=-1.0, x0=0.0, v0=0.0,
+                           u_min=-np.inf, u_max=np.inf, scheme="euler"):
+    """
+    Closed-loop step response of many gain candidates at once.
+
+    gains: array (N, 3) of (kp, ki, kd), one row per candidate
+    Plants are a PlantBank (scheme "euler" is exactly Plant.step, "exact" stays
+    accurate at much larger dt) and the controller is a PIDBank fed the true
+    state, so every candidate advances in one vectorized step.
+
+    Metrics are accumulated on the fly, nothing of size (N, steps) is stored.
+    Returns a dict of (N,) arrays: rise_time, overshoot, ise, effort.
+    """
+    gains = np.atleast_2d(np.asarray(gains, dtype=float))
+    n = gains.shape[0]
+
+    pid = PIDBank(n, target, kp=gains[:, 0], ki=gains[:, 1], kd=gains[:, 2], u_min=u_min, u_max=u_max)
+
+    plant = PlantBank(n, x0=x0, v0=v0, damping=damping, disturbance=disturbance, scheme=scheme)
+    x, v = plant.x, plant.v
+    step_size = target - x0
+
+    t_10 = np.full(n, np.inf)
+    t_90 = np.full(n, np.inf)
+    peak = np.full(n, -np.inf)
+    ise = np.zeros(n)
+    effort = np.zeros(n)
+    prev_progress = (x - x0) / step_size
+
+    for k in range(steps):
+        u = pid.compute(x, v, dt)
+
+        x, v = plant.step(u, dt)
+
+        # progress through the step: 0 at x0, 1 at target
+        progress = (x - x0) / step_size
+        t = (k + 1) * dt
+        _mark_crossing(t_10, 0.1, prev_progress, progress, t, dt)
+        _mark_crossing(t_90, 0.9, prev_progress, progress, t, dt)
+        np.maximum(peak, progress, out=peak)
+        prev_progress = progress
+
+        error = target - x
+        ise += error * error * dt
+        effort += u * u * dt
+
+    # never reaching 90% of the step counts as an infinite rise time
+    rise_time = np.full(n, np.inf)
+    reached = np.isfinite(t_90)
+    rise_time[reached] = t_90[reached] - t_10[reached]
+
+    return {
+        "rise_time": rise_time,
+        "overshoot": 100.0 * np.maximum(peak - 1.0, 0.0),
+        "ise": ise,
+        "effort": effort,
+    }
+
+def _mark_crossing(t_cross, level, prev, cur, t, dt):
+    """
+    Record the first time progress crosses level, interpolated inside the step
+    (keeps the cost continuous in the gains instead of jumping by whole dt).
+    """
+    hit = np.isinf(t_cross) & (cur >= level)
+    if hit.any():
+        frac = (cur[hit] - level) / np.maximum(cur[hit] - prev[hit], 1e-12)
+        t_cross[hit] = t - np.clip(frac, 0.0, 1.0) * dt
+
+def score(metrics, weights=None):
+    """
+    Weighted cost of each candidate (lower is better); responses that never rise or blow up get FAILED_COST.
+    """
+    weights = DEFAULT_WEIGHTS if weights is None else weights
+
+    cost = sum(w * metrics[name] for name, w in weights.items())
+    return np.where(np.isfinite(cost), cost, FAILED_COST)
+
+def evaluate(gains, weights=None, prefilter=True, **sim_kwargs):
+    """
+    Cost of each gain candidate (N, 3) -> (N,).
+
+    With prefilter, candidates whose closed loop is unstable (analysis.screen,
+    closed-form poles) get FAILED_COST without being simulated. The screen is
+    linear, so it is skipped when actuator limits are set.
+    """
+    gains = np.atleast_2d(np.asarray(gains, dtype=float))
+    cost = np.full(gains.shape[0], FAILED_COST)
+
+    limited = np.isfinite(sim_kwargs.get("u_min", -np.inf)) or np.isfinite(sim_kwargs.get("u_max", np.inf))
+    if prefilter and not limited:
+        ok = screen(gains, sim_kwargs.get("dt", 0.1), sim_kwargs.get("damping", 0.5),
+                    sim_kwargs.get("scheme", "euler"))
+    else:
+        ok = np.ones(gains.shape[0], dtype=bool)
+
+    if ok.any():
+        cost[ok] = score(simulate_step_response(gains[ok], **sim_kwargs), weights)
+    return cost
+
+def check_prefilter(n=2000, bounds=DEFAULT_BOUNDS, seed=0, **sim_kwargs):
+    """
+    Regression check of the stability prefilter (actuator limits off).
+
+    Draws n candidates in the bounds (a quarter of them on ki = 0) and compares
+    evaluate with and without the prefilter: every candidate passing the screen
+    must get the same cost both ways. Returns the number of mismatches.
+    """
+    lo = np.array([b[0] for b in bounds], dtype=float)
+    hi = np.array([b[1] for b in bounds], dtype=float)
+    gains = np.random.default_rng(seed).uniform(lo, hi, (n, len(bounds)))
+    gains[: n // 4, 1] = 0.0
+
+    ok = screen(gains, sim_kwargs.get("dt", 0.1), sim_kwargs.get("damping", 0.5),
+                sim_kwargs.get("scheme", "euler"))
+    screened = evaluate(gains, prefilter=True, **sim_kwargs)
+    full = evaluate(gains, prefilter=False, **sim_kwargs)
+    return int(np.sum(screened[ok] != full[ok]))
+
+def grid_refine(bounds=DEFAULT_BOUNDS, n_grid=11, rounds=4, shrink=0.3, weights=None, **sim_kwargs):
+    """
+    Grid search, then repeatedly re-grid a smaller box around the best point.
+
+    Each round evaluates all n_grid^3 candidates in one batch; the box shrinks by
+    `shrink` per round and never leaves the original bounds.
+    Returns (best_gains, best_cost, n_evaluations).
+    """
+    lo = np.array([b[0] for b in bounds], dtype=float)
+    hi = np.array([b[1] for b in bounds], dtype=float)
+    box_lo, box_hi = lo.copy(), hi.copy()
+
+    best, best_cost, n_eval = None, np.inf, 0
+    for _ in range(rounds):
+        axes = [np.linspace(a, b, n_grid) for a, b in zip(box_lo, box_hi)]
+        candidates = np.stack(np.meshgrid(*axes, indexing="ij"), axis=-1).reshape(-1, len(bounds))
+
+        cost = evaluate(candidates, weights, **sim_kwargs)
+        n_eval += len(candidates)
+
+        i = int(np.argmin(cost))
+        if cost[i] < best_cost:
+            best, best_cost = candidates[i], cost[i]
+
+        # next box: shrunk around the best point, clipped to the bounds
+        half = 0.5 * shrink * (box_hi - box_lo)
+        box_lo = np.maximum(best - half, lo)
+        box_hi = np.minimum(best + half, hi)
+
+    return best, float(best_cost), n_eval
+
+def cma_es(bounds=DEFAULT_BOUNDS, x0=None, sigma0=0.3, popsize=32, generations=40,
+           seed=None, weights=None, **sim_kwargs):
+    """
+    CMA-ES over the gains, one population per batched evaluation.
+
+    The search runs in coordinates normalized to the bounds ([0, 1] per gain),
+    so sigma0 is a fraction of the search box. Samples outside the box are
+    evaluated at their clipped point plus a penalty for the distance outside.
+    Returns (best_gains, best_cost, n_evaluations).
+    """
+    lo = np.array([b[0] for b in bounds], dtype=float)
+    hi = np.array([b[1] for b in bounds], dtype=float)
+    width = hi - lo
+    n = len(bounds)
+    rng = np.random.default_rng(seed)
+
+    # strategy parameters (Hansen's defaults)
+    lam = popsize
+    mu = lam // 2
+    w = np.log(mu + 0.5) - np.log(np.arange(1, mu + 1))
+    w /= w.sum()
+    mueff = 1.0 / np.sum(w**2)
+
+    cc = (4 + mueff / n) / (n + 4 + 2 * mueff / n)
+    cs = (mueff + 2) / (n + mueff + 5)
+    c1 = 2 / ((n + 1.3)**2 + mueff)
+    cmu = min(1 - c1, 2 * (mueff - 2 + 1 / mueff) / ((n + 2)**2 + mueff))
+    damps = 1 + 2 * max(0.0, np.sqrt((mueff - 1) / (n + 1)) - 1) + cs
+    chi_n = np.sqrt(n) * (1 - 1 / (4 * n) + 1 / (21 * n**2))
+
+    mean = np.full(n, 0.5) if x0 is None else (np.asarray(x0, dtype=float) - lo) / width
+    sigma = sigma0
+    C = np.eye(n)
+    p_c = np.zeros(n)
+    p_s = np.zeros(n)
+
+    best, best_cost, n_eval = None, np.inf, 0
+    for gen in range(generations):
+        # C = B diag(D^2) B^T
+        D2, B = np.linalg.eigh(C)
+        D = np.sqrt(np.maximum(D2, 1e-20))
+
+        z = rng.standard_normal((lam, n))
+        y = z @ (B * D).T
+        samples = mean + sigma * y
+        candidates = np.clip(samples, 0.0, 1.0)
+
+        # out-of-box samples are simulated at the clipped point and ranked worse by
+        # their distance outside, which pulls the search back instead of letting sigma grow
+        cost = evaluate(lo + candidates * width, weights, **sim_kwargs)
+        cost = cost + BOUND_PENALTY * np.sum((samples - candidates)**2, axis=1)
+        n_eval += lam
+
+        order = np.argsort(cost)
+        if cost[order[0]] < best_cost:
+            best, best_cost = lo + candidates[order[0]] * width, cost[order[0]]
+
+        # recombination of the mu best steps
+        y_w = w @ y[order[:mu]]
+        mean = mean + sigma * y_w
+
+        # step-size and covariance paths
+        C_inv_sqrt = (B / D) @ B.T
+        p_s = (1 - cs) * p_s + np.sqrt(cs * (2 - cs) * mueff) * (C_inv_sqrt @ y_w)
+        h_sig = np.linalg.norm(p_s) / np.sqrt(1 - (1 - cs)**(2 * (gen + 1))) / chi_n < 1.4 + 2 / (n + 1)
+        p_c = (1 - cc) * p_c + h_sig * np.sqrt(cc * (2 - cc) * mueff) * y_w
+
+        # rank-one + rank-mu covariance update
+        y_mu = y[order[:mu]]
+        C = ((1 - c1 - cmu) * C
+             + c1 * (np.outer(p_c, p_c) + (1 - h_sig) * cc * (2 - cc) * C)
+             + cmu * (y_mu.T * w) @ y_mu)
+        sigma *= np.exp((cs / damps) * (np.linalg.norm(p_s) / chi_n - 1))
+
+    return best, float(best_cost), n_eval
+
+def tune(method="cma", bounds=DEFAULT_BOUNDS, weights=None, seed=None, **sim_kwargs):
+    """
+    Tune (kp, ki, kd) with "cma" or "grid" (seed only affects "cma").
+
+    Returns a dict with the best gains, their cost and metrics, and the number of evaluated candidates.
+    """
+    if method == "cma":
+        gains, cost, n_eval = cma_es(bounds, seed=seed, weights=weights, **sim_kwargs)
+    elif method == "grid":
+        gains, cost, n_eval = grid_refine(bounds, weights=weights, **sim_kwargs)
+    else:
+        raise ValueError(f"unknown tuning method {method!r} (expected 'cma' or 'grid')")
+
+    metrics = simulate_step_response(gains[None, :], **sim_kwargs)
+    return {
+        "kp": float(gains[0]),
+        "ki": float(gains[1]),
+        "kd": float(gains[2]),
+        "cost": cost,
+        "metrics": {name: float(value[0]) for name, value in metrics.items()},
+        "evaluations": n_eval,
+    }
+
+def get_args():
+    p = argparse.ArgumentParser(description="Automatic PID gain tuning against the 1D plant")
+    p.add_argument("--method", choices=("cma", "grid"), default="cma", help="Optimizer")
+    p.add_argument("--target", type=float, default=10.0, help="Step target position")
+    p.add_argument("--dt", type=float, default=0.1, help="Simulation timestep")
+    p.add_argument("--steps", type=int, default=1000, help="Steps per candidate simulation")
+    p.add_argument("--u-max", type=float, default=np.inf, help="Actuator limit (symmetric)")
+    p.add_argument("--scheme", choices=("euler", "rk4", "exact"), default="euler", help="Plant integration scheme")
+    p.add_argument("--seed", type=int, default=0, help="Random seed (cma)")
+    p.add_argument("--check-prefilter", action="store_true",
+                   help="Only check that the stability prefilter agrees with full simulation")
+    return p.parse_args()
+
+if __name__ == "__main__":
+    args = get_args()
+    if args.check_prefilter:
+        mismatches = check_prefilter(seed=args.seed, target=args.target, dt=args.dt, steps=args.steps,
+                                     scheme=args.scheme)
+        print(f"prefilter check: {mismatches} mismatches")
+        raise SystemExit(1 if mismatches else 0)
+
+    result = tune(args.method, seed=args.seed,
+                  target=args.target, dt=args.dt, steps=args.steps, u_min=-args.u_max, u_max=args.u_max,
+                  scheme=args.scheme)
+
+    print(f"kp={result['kp']:.4f}  ki={result['ki']:.4f}  kd={result['kd']:.4f}  "
+          f"cost={result['cost']:.4f}  ({result['evaluations']} candidates evaluated)")
+    for name, value in result["metrics"].items():
+        print(f"  {name}: {value:.4f}")
@@ -0,0 +1,65 @@
+from dataclasses import dataclass
+
+@dataclass
+class SimulationConfig:
+    """
+    Parameters of one sensor-fusion run (Plant2D + IMU + GPS + KalmanFilter2D + PD control).
+
+    Defaults reproduce simulate_fastGPS.py.
+    """
+
+    # timing
+    dt: float = 0.1
+    sim_time: float = 20.0
+
+    # plant: initial state and hidden disturbance
+    x0: float = 0.0
+    y0: float = 0.0
+    vx0: float = 0.0
+    vy0: float = 0.0
+    x_disturbance: float = -1.0
+    y_disturbance: float = -0.75
+
+    # IMU: true bias and noise
+    bax_true: float = 0.05
+    bay_true: float = 0.08
+    imu_noise_std: float = 0.05
+
+    # GPS: noise and update interval (in steps)
+    gps_noise_std: float = 1.0
+    gps_update_interval: int = 5
+
+    # GPS timing for the event-driven simulation
+    # gps_rate_hz: native rate, need not divide the IMU rate (None -> one fix every gps_update_interval steps)
+    # gps_jitter_std: Gaussian jitter (s) on every fix time
+    # gps_delay: mean latency (s) between taking a fix and the filter receiving it
+    # gps_delay_std: Gaussian spread (s) of each fix's latency, drawn per fix (clipped at 0),
+    #                so a slow fix can arrive after the next one
+    gps_rate_hz: float | None = None
+    gps_jitter_std: float = 0.0
+    gps_delay: float = 0.0
+    gps_delay_std: float = 0.0
+
+    # Kalman filter tuning
+    Q_imu: float = 0.01
+    Q_bias: float = 0.001
+    R_gps: float = 1.0
+
+    # PD controller
+    kp: float = 0.1
+    kd: float = 0.05
+    x_desired: float = 0.0
+    y_desired: float = 0.0
+
+    # random seed (None -> fresh entropy); each sensor gets its own stream spawned from it
+    seed: int | None = None
+
+    @property
+    def steps(self):
+        return int(self.sim_time/self.dt)
+
+    @property
+    def gps_period(self):
+        if self.gps_rate_hz is not None:
+            return 1.0 / self.gps_rate_hz
+        return self.gps_update_interval * self.dt
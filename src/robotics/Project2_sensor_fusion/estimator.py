@@ -106,10 +106,11 @@ class KalmanFilter2D:
         self.x_hat[1] = self.x_hat[1] + K_y * innovation_y
 
         # esimated acceleration bias = current acceleration bias - K_bias * innovation
-        bias_correction_x = np.clip(innovation_x, -self.bias_clip, self.bias_clip)
+        # (plain min/max: np.clip on a Python float is far slower at IMU rate)
+        bias_correction_x = min(max(innovation_x, -self.bias_clip), self.bias_clip)
         self.x_hat[4] = self.x_hat[4] + self.bias_alpha * bias_correction_x
 
-        bias_correction_y = np.clip(innovation_y, -self.bias_clip, self.bias_clip)
+        bias_correction_y = min(max(innovation_y, -self.bias_clip), self.bias_clip)
         self.x_hat[5] = self.x_hat[5] + self.bias_alpha * bias_correction_y
 
         # self.x_hat[4] = self.x_hat[4] - K_b * innovation / (self.dt ** 2)
@@ -119,3 +120,282 @@ class KalmanFilter2D:
         self.P_y = (1-K_y) * self.P_y
     
 
+
+
+class KalmanFilter2DBank:
+    """
+    N independent KalmanFilter2D filters stored as contiguous arrays.
+
+    State:      x_hat (N, 6) -> [x, y, vx, vy, bax, bay] per filter
+    Covariance: P     (N, 6) -> diagonal [P_x, P_y, P_vx, P_vy, P_bx, P_by] per filter
+
+    Runs the exact same math as KalmanFilter2D, one vectorized call per tick
+    for the whole fleet instead of one Python call per filter.
+    """
+
+    def __init__(self, n, dt, x0, y0, vx0, vy0, bax, bay, Q_imu, Q_bias, R_gps):
+        self.n = n
+        self.dt = dt
+
+        # state estimate, one row per filter (scalars broadcast to every filter)
+        self.x_hat = np.empty((n, 6))
+        self.x_hat[:, 0] = x0
+        self.x_hat[:, 1] = y0
+        self.x_hat[:, 2] = vx0
+        self.x_hat[:, 3] = vy0
+        self.x_hat[:, 4] = bax
+        self.x_hat[:, 5] = bay
+
+        # same initial uncertainty as KalmanFilter2D
+        self.P = np.empty((n, 6))
+        self.P[:] = [1.0, 0.8, 1.0, 0.75, 0.1, 0.08]
+
+        # noise terms may be scalars or per-filter arrays of shape (N,)
+        self.Q_imu = Q_imu
+        self.Q_bias = Q_bias
+        self.R_gps = R_gps
+
+        # bias terms
+        self.bias_alpha = 0.001
+        self.bias_clip = 0.5
+
+    @classmethod
+    def from_filters(cls, filters):
+        """
+        Build a bank from existing KalmanFilter2D objects (state and uncertainty are copied).
+        """
+        first = filters[0]
+        bank = cls(len(filters), first.dt, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0,
+                   Q_imu=np.array([f.Q_imu for f in filters], dtype=float),
+                   Q_bias=np.array([f.Q_bias for f in filters], dtype=float),
+                   R_gps=np.array([f.R_gps for f in filters], dtype=float))
+
+        bank.x_hat[:] = [f.x_hat for f in filters]
+        bank.P[:] = [[f.P_x, f.P_y, f.P_vx, f.P_vy, f.P_bx, f.P_by] for f in filters]
+        bank.bias_alpha = np.array([f.bias_alpha for f in filters], dtype=float)
+        bank.bias_clip = np.array([f.bias_clip for f in filters], dtype=float)
+        return bank
+
+    def predict(self, ax_meas, ay_meas):
+        """
+        Propagate every filter using its IMU sample.
+
+        ax_meas, ay_meas: measured accelerations, shape (N,)
+        """
+        dt = self.dt
+        x_hat = self.x_hat
+        P = self.P
+
+        # bias-corrected acceleration
+        ax_used = ax_meas - x_hat[:, 4]
+        ay_used = ay_meas - x_hat[:, 5]
+
+        # position and velocity prediction, same operation order as KalmanFilter2D.predict
+        # (vy integrates the raw ay_meas, exactly like the scalar filter)
+        x_hat[:, 0] = x_hat[:, 0] + x_hat[:, 2] * dt + (ax_used * dt**2)/2
+        x_hat[:, 1] = x_hat[:, 1] + x_hat[:, 3] * dt + (ay_used * dt**2)/2
+        x_hat[:, 2] = x_hat[:, 2] + ax_used * dt
+        x_hat[:, 3] = x_hat[:, 3] + ay_meas * dt
+
+        # IMU uncertainty = IMU noise + acceleration bias uncertainty
+        Q_eff_x = self.Q_imu + P[:, 4]
+        Q_eff_y = self.Q_imu + P[:, 5]
+
+        # position uses the velocity uncertainty from before this step, so it goes first
+        P[:, 0] = P[:, 0] + P[:, 2] * dt**2 + (Q_eff_x * dt**4)/4
+        P[:, 1] = P[:, 1] + P[:, 3] * dt**2 + (Q_eff_y * dt**4)/4
+        P[:, 2] = P[:, 2] + Q_eff_x * dt**2
+        P[:, 3] = P[:, 3] + Q_eff_y * dt**2
+        P[:, 4] = P[:, 4] + self.Q_bias * dt
+        P[:, 5] = P[:, 5] + self.Q_bias * dt
+
+    def update_gps(self, mask, z_gps_x, z_gps_y):
+        """
+        GPS correction step for the filters that received a fix.
+
+        mask: boolean array (N,), True where a GPS fix is available
+        z_gps_x, z_gps_y: GPS positions, shape (N,) (ignored where mask is False)
+        """
+        idx = np.flatnonzero(mask)
+        if idx.size == 0:
+            return
+
+        x_hat = self.x_hat
+        P = self.P
+
+        # per-filter parameters only need the rows being corrected
+        R_gps = _take_rows(self.R_gps, idx)
+        bias_alpha = _take_rows(self.bias_alpha, idx)
+        bias_clip = _take_rows(self.bias_clip, idx)
+
+        P_x = P[idx, 0]
+        P_y = P[idx, 1]
+
+        # innovation = z_gps - x_prediction
+        innovation_x = np.asarray(z_gps_x)[idx] - x_hat[idx, 0]
+        innovation_y = np.asarray(z_gps_y)[idx] - x_hat[idx, 1]
+
+        # Kalman gain
+        K_x = P_x / (P_x + R_gps)
+        K_y = P_y / (P_y + R_gps)
+
+        # correct position
+        x_hat[idx, 0] = x_hat[idx, 0] + K_x * innovation_x
+        x_hat[idx, 1] = x_hat[idx, 1] + K_y * innovation_y
+
+        # nudge acceleration bias with the clipped innovation
+        x_hat[idx, 4] = x_hat[idx, 4] + bias_alpha * np.clip(innovation_x, -bias_clip, bias_clip)
+        x_hat[idx, 5] = x_hat[idx, 5] + bias_alpha * np.clip(innovation_y, -bias_clip, bias_clip)
+
+        # update uncertainty
+        P[idx, 0] = (1-K_x) * P_x
+        P[idx, 1] = (1-K_y) * P_y
+
+
+class KalmanFilter2DFull:
+    """
+    State: [x, y, vx, vy, bax, bay]
+
+    Full-covariance version of KalmanFilter2D (opt-in matrix mode).
+
+    Uses a proper 6x6 covariance P so cross-covariance between position,
+    velocity and accelerometer bias is modeled. The bias is then learned by
+    the regular Kalman gain, no bias_alpha / bias_clip nudge is needed.
+    Unlike KalmanFilter2D, vy integrates the bias-corrected ay as well.
+
+    F/Q are built once per dt, and predict/update_gps work entirely in
+    preallocated buffers (no per-step array allocation).
+    """
+
+    def __init__(self, dt, x0, y0, vx0, vy0, bax, bay, Q_imu, Q_bias, R_gps):
+        self.Q_imu = Q_imu
+        self.Q_bias = Q_bias
+        self.R_gps = R_gps
+
+        # state estimate
+        self.x_hat = np.array([x0, y0, vx0, vy0, bax, bay], dtype=float)
+
+        # same starting uncertainty as KalmanFilter2D, now as a full matrix
+        self.P = np.diag([1.0, 0.8, 1.0, 0.75, 0.1, 0.08])
+
+        # (F, F^T, B, Q) per dt, so switching between known rates never rebuilds them
+        self._models = {}
+        self.set_dt(dt)
+
+        # scratch buffers for the hot path
+        self._u = np.zeros(2)
+        self._x_tmp = np.zeros(6)
+        self._Bu = np.zeros(6)
+        self._FP = np.zeros((6, 6))
+        self._y = np.zeros(2)
+        self._S_inv = np.zeros((2, 2))
+        self._K = np.zeros((6, 2))
+        self._dx = np.zeros(6)
+        self._AP = np.zeros((6, 6))
+        self._KKt = np.zeros((6, 6))
+
+        # A = I - K H; H picks x and y, so only the first two columns ever change
+        self._A = np.eye(6)
+        self._I_xy = np.eye(6)[:, :2].copy()
+
+    def set_dt(self, dt):
+        """
+        Switch the prediction model to a new timestep (cached per dt).
+        """
+        self.dt = dt
+
+        if dt not in self._models:
+            self._models[dt] = self._build_model(dt)
+
+        self._F, self._F_T, self._B, self._Q = self._models[dt]
+
+    def _build_model(self, dt):
+        """
+        Build F, F^T, B and Q for the constant-acceleration model with bias states.
+        """
+        half_dt2 = 0.5 * dt**2
+
+        # x_k+1 = F x_k + B a_meas, where the bias is subtracted from the measured acceleration
+        F = np.eye(6)
+        F[0, 2] = dt
+        F[1, 3] = dt
+        F[0, 4] = -half_dt2
+        F[1, 5] = -half_dt2
+        F[2, 4] = -dt
+        F[3, 5] = -dt
+
+        B = np.zeros((6, 2))
+        B[0, 0] = half_dt2
+        B[1, 1] = half_dt2
+        B[2, 0] = dt
+        B[3, 1] = dt
+
+        # IMU noise enters through B, bias random walk enters the bias states directly
+        Q = self.Q_imu * (B @ B.T)
+        Q[4, 4] += self.Q_bias * dt
+        Q[5, 5] += self.Q_bias * dt
+
+        return F, np.ascontiguousarray(F.T), B, Q
+
+    def predict(self, ax_meas, ay_meas):
+        """
+        Propagate state and full covariance using IMU.
+        """
+        # x = F x + B u
+        self._u[0] = ax_meas
+        self._u[1] = ay_meas
+        np.matmul(self._F, self.x_hat, out=self._x_tmp)
+        np.matmul(self._B, self._u, out=self._Bu)
+        np.add(self._x_tmp, self._Bu, out=self.x_hat)
+
+        # P = F P F^T + Q
+        np.matmul(self._F, self.P, out=self._FP)
+        np.matmul(self._FP, self._F_T, out=self.P)
+        np.add(self.P, self._Q, out=self.P)
+
+    def update_gps(self, z_gps_x, z_gps_y):
+        """
+        GPS correction step (Joseph form).
+        """
+        P = self.P
+        R = self.R_gps
+
+        # innovation = z_gps - H x
+        self._y[0] = z_gps_x - self.x_hat[0]
+        self._y[1] = z_gps_y - self.x_hat[1]
+
+        # S = H P H^T + R is the 2x2 position block, inverted in closed form
+        s00 = P[0, 0] + R
+        s01 = P[0, 1]
+        s10 = P[1, 0]
+        s11 = P[1, 1] + R
+        det = s00 * s11 - s01 * s10
+        self._S_inv[0, 0] = s11 / det
+        self._S_inv[0, 1] = -s01 / det
+        self._S_inv[1, 0] = -s10 / det
+        self._S_inv[1, 1] = s00 / det
+
+        # K = P H^T S^-1 (P H^T is just the first two columns of P)
+        np.matmul(P[:, :2], self._S_inv, out=self._K)
+
+        # x = x + K y
+        np.matmul(self._K, self._y, out=self._dx)
+        np.add(self.x_hat, self._dx, out=self.x_hat)
+
+        # Joseph form: P = (I - K H) P (I - K H)^T + K R K^T
+        # stays symmetric positive semi-definite even with rounding, unlike (I - K H) P
+        np.subtract(self._I_xy, self._K, out=self._A[:, :2])
+        np.matmul(self._A, P, out=self._AP)
+        np.matmul(self._AP, self._A.T, out=P)
+        np.matmul(self._K, self._K.T, out=self._KKt)
+        self._KKt *= R
+        np.add(P, self._KKt, out=P)
+
+
+def _take_rows(value, idx):
+    """
+    Select rows of a per-filter parameter, passing scalars through unchanged.
+    """
+    if np.ndim(value) == 0:
+        return value
+    return np.asarray(value)[idx]
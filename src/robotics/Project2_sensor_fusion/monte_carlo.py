@@ -0,0 +1,134 @@
+import numpy as np
+from config import SimulationConfig
+from estimator import KalmanFilter2DBank
+
+def run_monte_carlo(n_trials, config=None, seed=None, bias_tol=0.01):
+    """
+    Run n_trials independent sensor-fusion simulations at once.
+
+    Every trial follows the same loop as the simulate_*GPS.py scripts, but the
+    trials are advanced together as arrays of shape (n_trials,) and the noise
+    is drawn up front as (n_trials, steps) arrays.
+
+    n_trials: number of independent trials
+    config: SimulationConfig (defaults to the fast GPS setup)
+    seed: seed for numpy.random.default_rng, for reproducible runs
+    bias_tol: |bias estimate - true bias| below which the bias counts as converged
+
+    Returns a dict of per-trial arrays and summary statistics.
+    """
+    if config is None:
+        config = SimulationConfig()
+
+    rng = np.random.default_rng(seed)
+    dt = config.dt
+    steps = config.steps
+
+    # GPS fires when its internal counter (1, 2, 3, ...) is a multiple of the interval
+    gps_steps = np.flatnonzero((np.arange(steps) + 1) % config.gps_update_interval == 0)
+    gps_slot = np.full(steps, -1)
+    gps_slot[gps_steps] = np.arange(gps_steps.size)
+
+    # pre-draw all sensor noise
+    imu_noise_x = rng.normal(0, config.imu_noise_std, size=(n_trials, steps))
+    imu_noise_y = rng.normal(0, config.imu_noise_std, size=(n_trials, steps))
+    gps_noise_x = rng.normal(0, config.gps_noise_std, size=(n_trials, gps_steps.size))
+    gps_noise_y = rng.normal(0, config.gps_noise_std, size=(n_trials, gps_steps.size))
+
+    # plant state, one entry per trial
+    px = np.full(n_trials, float(config.x0))
+    py = np.full(n_trials, float(config.y0))
+    pvx = np.full(n_trials, float(config.vx0))
+    pvy = np.full(n_trials, float(config.vy0))
+
+    kalman = KalmanFilter2DBank(n_trials, dt, x0=0, y0=0, vx0=0, vy0=0, bax=0, bay=0,
+                                Q_imu=config.Q_imu, Q_bias=config.Q_bias, R_gps=config.R_gps)
+    all_trials = np.ones(n_trials, dtype=bool)
+
+    # logs (trials x steps)
+    x_true = np.empty((n_trials, steps))
+    y_true = np.empty((n_trials, steps))
+    x_est = np.empty((n_trials, steps))
+    y_est = np.empty((n_trials, steps))
+    bias_est_x = np.empty((n_trials, steps))
+    bias_est_y = np.empty((n_trials, steps))
+
+    for k in range(steps):
+        x_true[:, k] = px
+        y_true[:, k] = py
+
+        # IMU measures zero true acceleration plus bias and noise (as in the scripts)
+        ax_measure = config.bax_true + imu_noise_x[:, k]
+        ay_measure = config.bay_true + imu_noise_y[:, k]
+
+        kalman.predict(ax_measure, ay_measure)
+
+        slot = gps_slot[k]
+        if slot >= 0:
+            kalman.update_gps(all_trials, px + gps_noise_x[:, slot], py + gps_noise_y[:, slot])
+
+        x_hat = kalman.x_hat
+        x_est[:, k] = x_hat[:, 0]
+        y_est[:, k] = x_hat[:, 1]
+
+        # PD control on the estimate
+        ax_command = config.kp * (config.x_desired - x_hat[:, 0]) - config.kd * x_hat[:, 2]
+        ay_command = config.kp * (config.y_desired - x_hat[:, 1]) - config.kd * x_hat[:, 3]
+
+        # plant step (same integration as Plant2D.step)
+        pvx += (ax_command + config.x_disturbance) * dt
+        pvy += (ay_command + config.y_disturbance) * dt
+        px += pvx * dt
+        py += pvy * dt
+
+        bias_est_x[:, k] = x_hat[:, 4]
+        bias_est_y[:, k] = x_hat[:, 5]
+
+    return summarize_trials(config, x_true, y_true, x_est, y_est, bias_est_x, bias_est_y, bias_tol)
+
+def summarize_trials(config, x_true, y_true, x_est, y_est, bias_est_x, bias_est_y, bias_tol):
+    """
+    RMSE and bias-convergence statistics from (trials x steps) logs.
+    """
+    err_x = x_est - x_true
+    err_y = y_est - y_true
+
+    rmse_x = np.sqrt(np.mean(err_x**2, axis=1))
+    rmse_y = np.sqrt(np.mean(err_y**2, axis=1))
+    rmse = np.sqrt(np.mean(err_x**2 + err_y**2, axis=1))
+
+    conv_x = _convergence_time(bias_est_x, config.bax_true, bias_tol, config.dt)
+    conv_y = _convergence_time(bias_est_y, config.bay_true, bias_tol, config.dt)
+    converged = ~np.isnan(conv_x) & ~np.isnan(conv_y)
+
+    return {
+        "n_trials": x_true.shape[0],
+        "rmse_x": rmse_x,
+        "rmse_y": rmse_y,
+        "rmse": rmse,
+        "rmse_mean": rmse.mean(),
+        "rmse_std": rmse.std(),
+        "rmse_p95": np.percentile(rmse, 95),
+        "bias_final_x": bias_est_x[:, -1],
+        "bias_final_y": bias_est_y[:, -1],
+        "bias_error_mean_x": np.mean(bias_est_x[:, -1] - config.bax_true),
+        "bias_error_mean_y": np.mean(bias_est_y[:, -1] - config.bay_true),
+        "bias_error_std_x": np.std(bias_est_x[:, -1]),
+        "bias_error_std_y": np.std(bias_est_y[:, -1]),
+        "bias_convergence_time_x": conv_x,
+        "bias_convergence_time_y": conv_y,
+        "bias_converged_fraction": converged.mean(),
+    }
+
+def _convergence_time(bias_est, bias_true, tol, dt):
+    """
+    Time after which each trial's bias error stays within tol (NaN if it never settles).
+    """
+    outside = np.abs(bias_est - bias_true) > tol
+    steps = outside.shape[1]
+
+    # index of the last step outside the tolerance band, -1 if always inside
+    last_outside = np.where(outside.any(axis=1), steps - 1 - np.argmax(outside[:, ::-1], axis=1), -1)
+
+    settle_step = last_outside + 1
+    return np.where(settle_step < steps, settle_step * dt, np.nan)
@@ -0,0 +1,456 @@
+import numpy as np
+
+# Nonlinear (EKF / UKF) filter banks with pluggable models.
+#
+# Every model function works on a batch: states are (M, n) arrays, inputs
+# (M, k) and measurements (M, m). A bank of N filters calls each function
+# once per step with all N filters (EKF) or all N * (2n + 1) sigma points
+# (UKF) stacked into one array, so nothing loops per filter in Python.
+
+
+class ProcessModel:
+    """
+    Motion model x_k+1 = f(x_k, u_k, dt) for batches of states.
+
+    f(x, u, dt):        x (M, n), u (M, k) or None  ->  (M, n)
+    Q:                  process noise, (n, n) array or callable Q(x, dt) -> (n, n) / (M, n, n)
+    jacobian(x, u, dt): optional df/dx -> (M, n, n); central differences when omitted
+    angles:             state indices holding angles (wrapped to [-pi, pi))
+    """
+
+    def __init__(self, f, Q, jacobian=None, angles=()):
+        self._f = f
+        self._Q = Q
+        self._jacobian = jacobian
+        self.angles = tuple(angles)
+
+    def f(self, x, u, dt):
+        return self._f(x, u, dt)
+
+    def noise(self, x, dt):
+        if callable(self._Q):
+            return self._Q(x, dt)
+        return np.asarray(self._Q, dtype=float)
+
+    def jacobian(self, x, u, dt):
+        if self._jacobian is not None:
+            return self._jacobian(x, u, dt)
+        return numerical_jacobian(lambda s: self.f(s, u, dt), x, self.angles)
+
+
+class MeasurementModel:
+    """
+    Measurement model z = h(x) for batches of states.
+
+    h(x):           x (M, n) -> (M, m)
+    R:              measurement noise, (m, m) array
+    jacobian(x):    optional dh/dx -> (M, m, n); central differences when omitted
+    angles:         measurement indices holding angles (residuals are wrapped)
+    """
+
+    def __init__(self, h, R, jacobian=None, angles=()):
+        self._h = h
+        self.R = np.atleast_2d(np.asarray(R, dtype=float))
+        self._jacobian = jacobian
+        self.angles = tuple(angles)
+
+    def h(self, x):
+        return self._h(x)
+
+    def jacobian(self, x):
+        if self._jacobian is not None:
+            return self._jacobian(x)
+        return numerical_jacobian(self.h, x, self.angles)
+
+
+class UnicycleModel(ProcessModel):
+    """
+    State: [x, y, heading, speed], input: [forward acceleration, yaw rate].
+
+    Heading/speed driven by an IMU-style input; accel_var / yaw_rate_var are the
+    input noise variances, mapped into Q through the input Jacobian.
+    """
+
+    def __init__(self, accel_var, yaw_rate_var):
+        self.accel_var = accel_var
+        self.yaw_rate_var = yaw_rate_var
+        super().__init__(self._step, self._noise, jacobian=self._step_jacobian, angles=(2,))
+
+    def _step(self, x, u, dt):
+        theta = x[:, 2]
+        v = x[:, 3]
+
+        out = np.empty_like(x)
+        out[:, 0] = x[:, 0] + v * np.cos(theta) * dt
+        out[:, 1] = x[:, 1] + v * np.sin(theta) * dt
+        out[:, 2] = _wrap(theta + u[:, 1] * dt)
+        out[:, 3] = v + u[:, 0] * dt
+        return out
+
+    def _step_jacobian(self, x, u, dt):
+        theta = x[:, 2]
+        v = x[:, 3]
+        cos = np.cos(theta)
+        sin = np.sin(theta)
+
+        F = np.zeros((x.shape[0], 4, 4))
+        F[:, 0, 0] = F[:, 1, 1] = F[:, 2, 2] = F[:, 3, 3] = 1.0
+        F[:, 0, 2] = -v * sin * dt
+        F[:, 0, 3] = cos * dt
+        F[:, 1, 2] = v * cos * dt
+        F[:, 1, 3] = sin * dt
+        return F
+
+    def _noise(self, x, dt):
+        # input noise enters heading through yaw rate and speed through acceleration
+        return np.diag([0.0, 0.0, self.yaw_rate_var * dt**2, self.accel_var * dt**2])
+
+
+class ConstantVelocityModel(ProcessModel):
+    """
+    State: [x, y, vx, vy], no input. White acceleration noise of variance accel_var per axis.
+    """
+
+    def __init__(self, accel_var):
+        self.accel_var = accel_var
+        super().__init__(self._step, self._noise, jacobian=self._step_jacobian)
+
+    def _step(self, x, u, dt):
+        out = x.copy()
+        out[:, 0] += x[:, 2] * dt
+        out[:, 1] += x[:, 3] * dt
+        return out
+
+    def _step_jacobian(self, x, u, dt):
+        F = np.eye(4)
+        F[0, 2] = F[1, 3] = dt
+        return np.broadcast_to(F, (x.shape[0], 4, 4))
+
+    def _noise(self, x, dt):
+        q = self.accel_var
+        Q = np.zeros((4, 4))
+        Q[0, 0] = Q[1, 1] = q * dt**4 / 4
+        Q[0, 2] = Q[2, 0] = Q[1, 3] = Q[3, 1] = q * dt**3 / 2
+        Q[2, 2] = Q[3, 3] = q * dt**2
+        return Q
+
+
+class PositionMeasurement(MeasurementModel):
+    """
+    GPS-style position fix: z = [x, y] taken from the state columns in index.
+    """
+
+    def __init__(self, R_gps, index=(0, 1)):
+        self.index = list(index)
+        R = np.asarray(R_gps, dtype=float)
+        if R.ndim == 0:
+            R = R * np.eye(len(self.index))
+        super().__init__(self._measure, R, jacobian=self._measure_jacobian)
+
+    def _measure(self, x):
+        return x[:, self.index]
+
+    def _measure_jacobian(self, x):
+        H = np.zeros((len(self.index), x.shape[1]))
+        H[np.arange(len(self.index)), self.index] = 1.0
+        return np.broadcast_to(H, (x.shape[0],) + H.shape)
+
+
+class RangeBearingMeasurement(MeasurementModel):
+    """
+    Range and bearing to a known landmark: z = [range, bearing].
+
+    Bearing is measured relative to the heading in column heading_index
+    (None = absolute bearing, e.g. for a state without heading).
+    """
+
+    def __init__(self, landmark, range_var, bearing_var, heading_index=2):
+        self.landmark = np.asarray(landmark, dtype=float)
+        self.heading_index = heading_index
+        super().__init__(self._measure, np.diag([range_var, bearing_var]),
+                         jacobian=self._measure_jacobian, angles=(1,))
+
+    def _measure(self, x):
+        dx = self.landmark[0] - x[:, 0]
+        dy = self.landmark[1] - x[:, 1]
+
+        z = np.empty((x.shape[0], 2))
+        z[:, 0] = np.hypot(dx, dy)
+        z[:, 1] = np.arctan2(dy, dx)
+        if self.heading_index is not None:
+            z[:, 1] = _wrap(z[:, 1] - x[:, self.heading_index])
+        return z
+
+    def _measure_jacobian(self, x):
+        dx = self.landmark[0] - x[:, 0]
+        dy = self.landmark[1] - x[:, 1]
+        q = dx * dx + dy * dy
+        r = np.sqrt(q)
+
+        H = np.zeros((x.shape[0], 2, x.shape[1]))
+        H[:, 0, 0] = -dx / r
+        H[:, 0, 1] = -dy / r
+        H[:, 1, 0] = dy / q
+        H[:, 1, 1] = -dx / q
+        if self.heading_index is not None:
+            H[:, 1, self.heading_index] = -1.0
+        return H
+
+
+class _NonlinearBank:
+    """
+    Shared bookkeeping for the EKF / UKF banks: N filters as x_hat (N, n) and P (N, n, n).
+    """
+
+    def __init__(self, process, dt, x0, P0, n=None, R_gps=1.0):
+        self.process = process
+        self.dt = dt
+
+        # x0 is one state (broadcast to n filters) or one row per filter
+        x0 = np.asarray(x0, dtype=float)
+        if x0.ndim == 1:
+            x0 = np.broadcast_to(x0, (1 if n is None else n, x0.shape[0]))
+        self.x_hat = np.array(x0, dtype=float)
+
+        dim = self.x_hat.shape[1]
+        self.P = np.array(np.broadcast_to(np.asarray(P0, dtype=float), (len(self), dim, dim)))
+
+        # GPS fix model used by update_gps (position in the first two state columns)
+        self.gps = PositionMeasurement(R_gps)
+
+    def __len__(self):
+        return self.x_hat.shape[0]
+
+    def predict(self, *u):
+        """
+        Propagate every filter through the process model.
+
+        u: model inputs, one (N,) array or scalar per input (e.g. predict(accel, yaw_rate))
+        """
+        self._propagate(_stack_inputs(u, len(self)))
+
+    def update_gps(self, mask, z_gps_x, z_gps_y):
+        """
+        GPS correction step for the filters that received a fix (same convention as KalmanFilter2DBank).
+
+        mask: boolean array (N,), True where a GPS fix is available
+        z_gps_x, z_gps_y: GPS positions, shape (N,) (ignored where mask is False)
+        """
+        z = np.column_stack(np.broadcast_arrays(z_gps_x, z_gps_y))
+        self.update(z, self.gps, mask)
+
+    def update(self, z, measurement, mask=None):
+        """
+        Correct the filters in mask (all when None) with measurements z (N, m).
+        """
+        if mask is None:
+            rows = slice(None)
+        else:
+            rows = np.flatnonzero(mask)
+            if rows.size == 0:
+                return
+
+        z = np.asarray(z, dtype=float).reshape(len(self), -1)[rows]
+        x, P = self._correct(self.x_hat[rows], self.P[rows], z, measurement)
+        self.x_hat[rows] = x
+        self.P[rows] = P
+
+    def append(self, x0, P0):
+        """
+        Add filters: x0 (k, n) states, P0 (n, n) or (k, n, n) covariances.
+        """
+        x0 = np.atleast_2d(np.asarray(x0, dtype=float))
+        dim = self.x_hat.shape[1]
+        P0 = np.broadcast_to(np.asarray(P0, dtype=float), (x0.shape[0], dim, dim))
+        self.x_hat = np.concatenate([self.x_hat, x0])
+        self.P = np.concatenate([self.P, P0])
+
+    def select(self, keep):
+        """
+        Keep only the filters in keep (boolean mask or index array), in that order.
+        """
+        self.x_hat = self.x_hat[keep]
+        self.P = self.P[keep]
+
+
+class ExtendedKalmanFilterBank(_NonlinearBank):
+    """
+    N extended Kalman filters sharing one process model.
+
+    Models are linearized with their (batched) Jacobians at every step; the
+    correction uses the Joseph form so P stays symmetric positive semi-definite.
+    """
+
+    def _propagate(self, u):
+        x = self.x_hat
+        F = self.process.jacobian(x, u, self.dt)
+        Q = self.process.noise(x, self.dt)
+
+        # x = f(x, u), P = F P F^T + Q
+        self.x_hat = self.process.f(x, u, self.dt)
+        self.P = F @ self.P @ np.swapaxes(F, 1, 2) + Q
+
+    def _correct(self, x, P, z, measurement):
+        H = measurement.jacobian(x)
+        H_T = np.swapaxes(H, 1, 2)
+        R = measurement.R
+
+        # innovation y = z - h(x) and its covariance S = H P H^T + R
+        y = _residual(z, measurement.h(x), measurement.angles)
+        PH_T = P @ H_T
+        S = H @ PH_T + R
+
+        # K = P H^T S^-1 (S is symmetric, so solve S K^T = H P)
+        K = np.swapaxes(np.linalg.solve(S, np.swapaxes(PH_T, 1, 2)), 1, 2)
+
+        x = x + np.einsum("mij,mj->mi", K, y)
+        _wrap_columns(x, self.process.angles)
+
+        # Joseph form: P = (I - K H) P (I - K H)^T + K R K^T
+        A = np.eye(x.shape[1]) - K @ H
+        P = A @ P @ np.swapaxes(A, 1, 2) + K @ R @ np.swapaxes(K, 1, 2)
+        return x, P
+
+
+class UnscentedKalmanFilterBank(_NonlinearBank):
+    """
+    N unscented Kalman filters sharing one process model.
+
+    Scaled sigma points (alpha, beta, kappa) are built for every filter at once
+    from a batched Cholesky factor, and the models are evaluated on all
+    N * (2n + 1) points in one call. Angles are averaged on the circle.
+    """
+
+    def __init__(self, process, dt, x0, P0, n=None, R_gps=1.0, alpha=1.0, beta=2.0, kappa=0.0):
+        super().__init__(process, dt, x0, P0, n=n, R_gps=R_gps)
+
+        dim = self.x_hat.shape[1]
+        self.lam = alpha**2 * (dim + kappa) - dim
+
+        # mean / covariance weights of the 2n + 1 sigma points
+        self.Wm = np.full(2 * dim + 1, 0.5 / (dim + self.lam))
+        self.Wc = self.Wm.copy()
+        self.Wm[0] = self.lam / (dim + self.lam)
+        self.Wc[0] = self.Wm[0] + (1.0 - alpha**2 + beta)
+
+    def _sigma_points(self, x, P):
+        """
+        Sigma points (M, 2n + 1, n): x, x + columns of sqrt((n + lam) P), x - columns.
+        """
+        dim = x.shape[1]
+        L = np.linalg.cholesky((dim + self.lam) * P)
+        offsets = np.swapaxes(L, 1, 2)
+
+        points = np.empty((x.shape[0], 2 * dim + 1, dim))
+        points[:, 0] = x
+        points[:, 1:dim + 1] = x[:, None, :] + offsets
+        points[:, dim + 1:] = x[:, None, :] - offsets
+        return points
+
+    def _propagate(self, u):
+        x = self.x_hat
+        M, dim = x.shape
+        k = 2 * dim + 1
+
+        points = self._sigma_points(x, self.P)
+        u_points = None if u is None else np.repeat(u, k, axis=0)
+        Y = self.process.f(points.reshape(M * k, dim), u_points, self.dt).reshape(M, k, dim)
+
+        angles = self.process.angles
+        self.x_hat = _weighted_mean(Y, self.Wm, angles)
+        dY = _residual(Y, self.x_hat[:, None, :], angles)
+        self.P = np.einsum("k,mki,mkj->mij", self.Wc, dY, dY) + self.process.noise(x, self.dt)
+
+    def _correct(self, x, P, z, measurement):
+        M, dim = x.shape
+        k = 2 * dim + 1
+
+        points = self._sigma_points(x, P)
+        Z = measurement.h(points.reshape(M * k, dim)).reshape(M, k, -1)
+
+        z_pred = _weighted_mean(Z, self.Wm, measurement.angles)
+        dZ = _residual(Z, z_pred[:, None, :], measurement.angles)
+        dX = _residual(points, x[:, None, :], self.process.angles)
+
+        # innovation covariance and state / measurement cross-covariance
+        S = np.einsum("k,mki,mkj->mij", self.Wc, dZ, dZ) + measurement.R
+        Pxz = np.einsum("k,mki,mkj->mij", self.Wc, dX, dZ)
+
+        # K = Pxz S^-1
+        K = np.swapaxes(np.linalg.solve(S, np.swapaxes(Pxz, 1, 2)), 1, 2)
+
+        y = _residual(z, z_pred, measurement.angles)
+        x = x + np.einsum("mij,mj->mi", K, y)
+        _wrap_columns(x, self.process.angles)
+
+        # P = P - K S K^T, symmetrized against rounding
+        P = P - K @ S @ np.swapaxes(K, 1, 2)
+        P = 0.5 * (P + np.swapaxes(P, 1, 2))
+        return x, P
+
+
+def numerical_jacobian(fun, x, angles=(), eps=1e-6):
+    """
+    Central-difference Jacobian of a batched function fun: (M, n) -> (M, m), returned as (M, m, n).
+
+    One pair of batched calls per state dimension; output differences in angles are wrapped.
+    """
+    M, n = x.shape
+    J = None
+
+    for j in range(n):
+        step = eps * np.maximum(1.0, np.abs(x[:, j]))
+        x_plus = x.copy()
+        x_minus = x.copy()
+        x_plus[:, j] += step
+        x_minus[:, j] -= step
+
+        diff = _residual(fun(x_plus), fun(x_minus), angles) / (2.0 * step[:, None])
+        if J is None:
+            J = np.empty((M, diff.shape[1], n))
+        J[:, :, j] = diff
+
+    return J
+
+
+def _stack_inputs(u, n):
+    """
+    Stack per-input arrays / scalars into one (n, k) input array (None when there are no inputs).
+    """
+    if not u:
+        return None
+    return np.column_stack([np.broadcast_to(np.asarray(a, dtype=float), (n,)) for a in u])
+
+
+def _wrap(angle):
+    """
+    Wrap angles to [-pi, pi).
+    """
+    return (angle + np.pi) % (2.0 * np.pi) - np.pi
+
+
+def _wrap_columns(a, angles):
+    """
+    Wrap the angle columns (last axis) of a in place.
+    """
+    if angles:
+        a[..., list(angles)] = _wrap(a[..., list(angles)])
+
+
+def _residual(a, b, angles):
+    """
+    a - b with the angle columns (last axis) wrapped.
+    """
+    d = a - b
+    _wrap_columns(d, angles)
+    return d
+
+
+def _weighted_mean(points, W, angles):
+    """
+    Weighted mean over sigma points (M, k, d) -> (M, d); angle columns use the circular mean.
+    """
+    mean = np.einsum("k,mkd->md", W, points)
+    for a in angles:
+        mean[:, a] = np.arctan2(W @ np.sin(points[..., a]).T, W @ np.cos(points[..., a]).T)
+    return mean
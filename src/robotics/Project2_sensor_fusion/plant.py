@@ -1,5 +1,12 @@
+import sys
+from pathlib import Path
+
 import numpy as np
 
+# helpers shared with the other projects live in src/robotics/robotics_common
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from robotics_common.discretization import zoh_coefficients, per_plant as _per_plant
+
 class Plant2D: 
     """
     Simulated 2D physical system (ground truth).
@@ -41,4 +48,100 @@ class Plant2D:
         self.y += self.vy * self.dt
 
     def get_state(self):
-        return np.array([self.x, self.y, self.vx, self.vy])
\ No newline at end of file
+        return np.array([self.x, self.y, self.vx, self.vy])
+
+# integration schemes offered by Plant2DBank
+SCHEMES = ("euler", "rk4", "exact")
+
+class Plant2DBank:
+    """
+    N Plant2D systems stored as arrays (N,), with per-plant disturbances and damping.
+
+    Each axis follows v' = a_command + disturbance - damping * v (damping = 0
+    is exactly Plant2D). step() advances every plant with the selected scheme:
+        "euler": semi-implicit Euler, exactly Plant2D.step
+        "rk4":   classic 4th-order Runge-Kutta
+        "exact": zero-order-hold discretization with the closed-form matrix
+                 exponential, computed once per dt (exact for commands held
+                 over the step)
+
+    damping is read-only while cached coefficients depend on it; assign a new
+    array (or scalar) to change it.
+    """
+
+    def __init__(self, n, dt, x0, y0, vx0, vy0, x_disturbance, y_disturbance, damping=0.0, scheme="euler"):
+        if scheme not in SCHEMES:
+            raise ValueError(f"scheme must be one of {SCHEMES}, got {scheme!r}")
+
+        self.n = n
+        self.dt = dt
+        self.scheme = scheme
+
+        self.x = _per_plant(x0, n)
+        self.y = _per_plant(y0, n)
+        self.vx = _per_plant(vx0, n)
+        self.vy = _per_plant(vy0, n)
+
+        self.ax_true = np.zeros(n)
+        self.ay_true = np.zeros(n)
+        self.disturbance_x = _per_plant(x_disturbance, n)
+        self.disturbance_y = _per_plant(y_disturbance, n)
+        self.damping = damping
+
+    @property
+    def damping(self):
+        return self._damping
+
+    @damping.setter
+    def damping(self, value):
+        self._damping = _per_plant(value, self.n)
+        self._damping.flags.writeable = False
+
+        # exact-scheme coefficients per dt
+        self._zoh = {}
+
+    def step(self, ax_command, ay_command):
+        """
+        Propagate every plant forward by dt.
+        """
+        self.ax_true = ax_command + self.disturbance_x
+        self.ay_true = ay_command + self.disturbance_y
+
+        if self.scheme == "euler":
+            # Plant2D.step plus the damping term, which is always applied (with damping = 0
+            # it leaves the acceleration unchanged, so this stays exactly Plant2D.step)
+            ax = self.ax_true - self.damping * self.vx
+            ay = self.ay_true - self.damping * self.vy
+            self.vx += ax * self.dt
+            self.vy += ay * self.dt
+            self.x += self.vx * self.dt
+            self.y += self.vy * self.dt
+        elif self.scheme == "rk4":
+            self.x, self.vx = _rk4_axis(self.x, self.vx, self.ax_true, self.damping, self.dt)
+            self.y, self.vy = _rk4_axis(self.y, self.vy, self.ay_true, self.damping, self.dt)
+        else:
+            if self.dt not in self._zoh:
+                self._zoh[self.dt] = zoh_coefficients(self.damping, self.dt)
+            e, g1, g2 = self._zoh[self.dt]
+
+            # [p, v]_k+1 = [[1, g1], [0, e]] [p, v]_k + [g2, g1] a
+            self.x, self.vx = self.x + g1 * self.vx + g2 * self.ax_true, e * self.vx + g1 * self.ax_true
+            self.y, self.vy = self.y + g1 * self.vy + g2 * self.ay_true, e * self.vy + g1 * self.ay_true
+
+    def get_state(self):
+        return np.stack([self.x, self.y, self.vx, self.vy], axis=1)
+
+def _rk4_axis(p, v, a, c, dt):
+    """
+    One RK4 step of p' = v, v' = a - c v.
+    """
+    k1p, k1v = v, a - c * v
+    v2 = v + 0.5 * dt * k1v
+    k2p, k2v = v2, a - c * v2
+    v3 = v + 0.5 * dt * k2v
+    k3p, k3v = v3, a - c * v3
+    v4 = v + dt * k3v
+    k4p, k4v = v4, a - c * v4
+
+    return (p + dt / 6.0 * (k1p + 2.0 * k2p + 2.0 * k3p + k4p),
+            v + dt / 6.0 * (k1v + 2.0 * k2v + 2.0 * k3v + k4v))
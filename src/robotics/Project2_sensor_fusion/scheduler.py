@@ -0,0 +1,86 @@
+import heapq
+
+# event times are kept as integer nanoseconds so that e.g. 0.4 + 0.5 and 9 * 0.1 land on the same tick
+TICKS_PER_SECOND = 1_000_000_000
+
+def to_ticks(t):
+    return round(t * TICKS_PER_SECOND)
+
+class EventScheduler:
+    """
+    Discrete-event timeline (min-heap ordered by time, then priority, then insertion order).
+
+    Sources are scheduled at their own rates, which need not be integer
+    multiples of each other; only real events are dispatched.
+    """
+
+    def __init__(self):
+        self._heap = []
+        self._seq = 0
+        self.now = 0.0
+        self.dispatched = 0
+
+    def schedule(self, time, handler, priority=0):
+        """
+        Run handler(time) at the given time (seconds).
+
+        priority: tie-breaker for events at the same time (lower runs first)
+        """
+        tick = to_ticks(time)
+        if tick < to_ticks(self.now):
+            raise ValueError(f"cannot schedule an event at t={time} before the current time t={self.now}")
+
+        heapq.heappush(self._heap, (tick, priority, self._seq, handler))
+        self._seq += 1
+
+    def every(self, period, handler, start=0.0, priority=0, stop=None, jitter_std=0.0, rng=None):
+        """
+        Run handler(time) periodically at start + n * period (seconds).
+
+        stop: no events at or after this time (None -> forever)
+        jitter_std: Gaussian timing jitter (s) added to every nominal time, it does not accumulate
+        rng: numpy.random.Generator for the jitter
+        """
+        if jitter_std > 0 and rng is None:
+            raise ValueError("jitter_std > 0 needs an rng")
+
+        stop_tick = None if stop is None else to_ticks(stop)
+
+        def schedule_nth(n):
+            nominal = start + n * period
+            if stop_tick is not None and to_ticks(nominal) >= stop_tick:
+                return
+
+            t = nominal
+            if jitter_std > 0:
+                t = max(nominal + rng.normal(0.0, jitter_std), self.now)
+
+            def fire(time):
+                handler(time)
+                schedule_nth(n + 1)
+
+            self.schedule(t, fire, priority)
+
+        schedule_nth(0)
+
+    def run(self, until=None):
+        """
+        Dispatch events in time order until the timeline is empty (or past `until`).
+
+        Returns the number of events dispatched.
+        """
+        until_tick = None if until is None else to_ticks(until)
+        count = 0
+
+        while self._heap:
+            tick = self._heap[0][0]
+            if until_tick is not None and tick > until_tick:
+                break
+
+            _, _, _, handler = heapq.heappop(self._heap)
+            self.now = tick / TICKS_PER_SECOND
+            handler(self.now)
+            count += 1
+
+        self.dispatched += count
+        return count
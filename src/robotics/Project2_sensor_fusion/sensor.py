@@ -1,4 +1,9 @@
-import numpy as np
+import sys
+from pathlib import Path
+
+# helpers shared with the other projects live in src/robotics/robotics_common
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from robotics_common.noise import NOISE_BLOCK_SIZE, NoiseBuffer
 
 class IMUSensor:
     """
@@ -7,20 +12,22 @@ class IMUSensor:
     Measures acceleration with:
     - additive noise
     - unknown constant or slowly drifting bias
+
+    rng: numpy.random.Generator for the noise stream (legacy global np.random stream if None)
     """
 
-    def __init__(self, bax_true, bay_true, noise_std):
+    def __init__(self, bax_true, bay_true, noise_std, rng=None, block_size=NOISE_BLOCK_SIZE):
         self.bias_ax = bax_true
         self.bias_ay = bay_true
         self.noise_std = noise_std
+        self.noise = NoiseBuffer(rng, block_size)
 
     def measure(self, ax_true, ay_true):
         """
         Return noisy biased acceleration measurement.
         """
-        # TODO: add bias + noise
-        ax_measure = ax_true + self.bias_ax + np.random.normal(0, self.noise_std)
-        ay_measure = ay_true + self.bias_ay + np.random.normal(0, self.noise_std)
+        ax_measure = ax_true + self.bias_ax + self.noise_std * self.noise.next()
+        ay_measure = ay_true + self.bias_ay + self.noise_std * self.noise.next()
         return ax_measure, ay_measure
 
 class GPSSensor:
@@ -28,12 +35,15 @@ class GPSSensor:
     GPS-like position sensor.
 
     Low-rate, noisy position measurements.
+
+    rng: numpy.random.Generator for the noise stream (legacy global np.random stream if None)
     """
 
-    def __init__(self, noise_std, update_interval):
+    def __init__(self, noise_std, update_interval, rng=None, block_size=NOISE_BLOCK_SIZE):
         self.noise_std = noise_std
         self.update_interval = update_interval
         self.counter = 0
+        self.noise = NoiseBuffer(rng, block_size)
 
     def measure(self, x_true, y_true):
         """
@@ -42,10 +52,17 @@ class GPSSensor:
         self.counter += 1
 
         if self.counter % self.update_interval == 0:
-            x_measure = x_true + np.random.normal(0, self.noise_std)
-            y_measure = y_true + np.random.normal(0, self.noise_std)
-
-            return x_measure, y_measure
+            return self.sample(x_true, y_true)
         
         else:
-            return None, None
\ No newline at end of file
+            return None, None
+
+    def sample(self, x_true, y_true):
+        """
+        Return a noisy position fix right now (used by the event scheduler, which only
+        calls the GPS at its own rate).
+        """
+        x_measure = x_true + self.noise_std * self.noise.next()
+        y_measure = y_true + self.noise_std * self.noise.next()
+
+        return x_measure, y_measure
@@ -0,0 +1,387 @@
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+from config import SimulationConfig
+from plant import Plant2D
+from sensor import IMUSensor, GPSSensor
+from estimator import KalmanFilter2D
+from scheduler import EventScheduler
+from telemetry import SENSOR_FUSION_SCHEMA, TelemetryRecorder
+
+PROJECT_NAME = "Sensor_Fusion"
+DEFAULT_OUT = Path(f"data/robotics/{PROJECT_NAME}")
+
+@dataclass
+class SimulationResult:
+    """
+    Logged channels of one run, each an array of shape (steps,)
+    (see telemetry.SENSOR_FUSION_SCHEMA).
+
+    GPS channels hold NaN on steps without a GPS fix.
+    """
+    config: SimulationConfig
+    time: np.ndarray
+
+    # true position - from the plant
+    x_true: np.ndarray
+    y_true: np.ndarray
+
+    # gps position - from GPS sensor, no bias but noisy
+    x_gps: np.ndarray
+    y_gps: np.ndarray
+
+    # imu dead-reckoning trajectory - from integrating IMU acceleration, smooth but drifts (-> bias)
+    x_imu: np.ndarray
+    y_imu: np.ndarray
+
+    # estimated values by Kalman filter
+    x_est: np.ndarray
+    y_est: np.ndarray
+    bias_est_x: np.ndarray
+    bias_est_y: np.ndarray
+
+@dataclass
+class EventSimulationResult(SimulationResult):
+    """
+    SimulationResult of the event-driven loop, plus one entry per delivered GPS fix.
+
+    x_gps / y_gps hold each fix on the IMU step it was applied to.
+    """
+    # time the fix was taken and time it reached the filter (s)
+    gps_stamp: np.ndarray
+    gps_arrival: np.ndarray
+    gps_fix_x: np.ndarray
+    gps_fix_y: np.ndarray
+
+    # fixes that arrived after a newer one had been applied, and were discarded
+    gps_dropped: int
+
+    # scheduler events dispatched during the run
+    events: int
+
+class SensorFusionSimulation:
+    """
+    Plant2D + IMUSensor + GPSSensor + Kalman filter + PD control, as an importable loop.
+
+    estimator_cls: filter class with the KalmanFilter2D constructor and
+                   predict / update_gps methods (e.g. KalmanFilter2DFull)
+    """
+
+    def __init__(self, estimator_cls=KalmanFilter2D):
+        self.estimator_cls = estimator_cls
+
+    def _build(self, config):
+        """
+        Create plant, sensors and filter for a config, plus a spare generator for timing jitter.
+        """
+        dt = config.dt
+
+        # independent, reproducible noise streams for the two sensors (and event timing)
+        imu_rng, gps_rng, timing_rng = [np.random.default_rng(s) for s in np.random.SeedSequence(config.seed).spawn(3)]
+
+        # -----------------------------
+        # Create system components
+        # -----------------------------
+        plant = Plant2D(dt=dt, x0=config.x0, y0=config.y0, vx0=config.vx0, vy0=config.vy0,
+                        ax_true=0, ay_true=0,
+                        x_disturbance=config.x_disturbance, y_disturbance=config.y_disturbance)
+
+        imu = IMUSensor(bax_true=config.bax_true, bay_true=config.bay_true, noise_std=config.imu_noise_std, rng=imu_rng)
+
+        gps = GPSSensor(noise_std=config.gps_noise_std, update_interval=config.gps_update_interval, rng=gps_rng)
+
+        kalman = self.estimator_cls(dt, x0=0, y0=0, vx0=0, vy0=0, bax=0, bay=0,
+                                    Q_imu=config.Q_imu, Q_bias=config.Q_bias, R_gps=config.R_gps)
+
+        return plant, imu, gps, kalman, timing_rng
+
+    def run(self, config=None, telemetry_dir=None):
+        """
+        Run one simulation and return a SimulationResult (no plotting).
+
+        telemetry_dir: folder for memory-mapped .npy channels (None -> logs stay in memory)
+        """
+        if config is None:
+            config = SimulationConfig()
+
+        dt = config.dt
+        steps = config.steps
+
+        plant, imu, gps, kalman, _ = self._build(config)
+
+        # -----------------------------
+        # Preallocated logs (NaN where no sample, e.g. GPS between fixes)
+        # -----------------------------
+        telemetry = TelemetryRecorder(SENSOR_FUSION_SCHEMA, steps, path=telemetry_dir)
+        x_true = telemetry.channel("x_true")
+        y_true = telemetry.channel("y_true")
+        x_gps = telemetry.channel("x_gps")
+        y_gps = telemetry.channel("y_gps")
+        x_imu = telemetry.channel("x_imu")
+        y_imu = telemetry.channel("y_imu")
+        x_est = telemetry.channel("x_est")
+        y_est = telemetry.channel("y_est")
+        bias_est_x = telemetry.channel("bias_est_x")
+        bias_est_y = telemetry.channel("bias_est_y")
+
+        imu_x = imu_y = 0.0
+        imu_vx = imu_vy = 0.0
+
+        for k in range(steps):
+            # true positions
+            x_true[k] = plant.x
+            y_true[k] = plant.y
+
+            ax_measure, ay_measure = imu.measure(0, 0)
+
+            z_gps_x, z_gps_y = gps.measure(plant.x, plant.y)
+
+            kalman.predict(ax_measure, ay_measure)
+
+            if z_gps_x is not None and z_gps_y is not None:
+                kalman.update_gps(z_gps_x, z_gps_y)
+                x_gps[k] = z_gps_x
+                y_gps[k] = z_gps_y
+
+            x_est[k] = kalman.x_hat[0]
+            y_est[k] = kalman.x_hat[1]
+
+            # IMU-only dead reckoning
+            imu_vx += ax_measure * dt
+            imu_vy += ay_measure * dt
+
+            imu_x += imu_vx * dt
+            imu_y += imu_vy * dt
+
+            x_imu[k] = imu_x
+            y_imu[k] = imu_y
+
+            # PD control law
+            # a_command = kp * (desired position - kalman estimated position) - kd * kalman estimated velocity
+            ax_command = config.kp * (config.x_desired - kalman.x_hat[0]) - config.kd * kalman.x_hat[2]
+            ay_command = config.kp * (config.y_desired - kalman.x_hat[1]) - config.kd * kalman.x_hat[3]
+
+            # feed controller command into the plant
+            plant.step(ax_command, ay_command)
+
+            # bias estimate tracking
+            bias_est_x[k] = kalman.x_hat[4]
+            bias_est_y[k] = kalman.x_hat[5]
+
+        telemetry.channel("time")[:] = np.arange(steps) * dt
+        telemetry.length = steps
+        telemetry.flush()
+
+        return SimulationResult(config=config, **telemetry.to_dict())
+
+class EventDrivenSimulation(SensorFusionSimulation):
+    """
+    Same loop as SensorFusionSimulation, driven by a discrete-event scheduler.
+
+    The IMU ticks every config.dt; the GPS fires at its own rate
+    (config.gps_period, optionally jittered). Each fix reaches the filter after
+    its own latency (config.gps_delay, spread by config.gps_delay_std), so fixes
+    can arrive late and out of order. A late fix is applied as if measured on
+    arrival (no retrodiction to its stamp); a fix older than one already applied
+    is dropped and counted. No GPS calls happen between fixes.
+
+    With the default config the event order (and so the result) matches
+    SensorFusionSimulation exactly.
+    """
+
+    # event priorities for the same timestamp: predict, then GPS, then control + plant step
+    IMU_PRIORITY = 0
+    GPS_PRIORITY = 1
+    CONTROL_PRIORITY = 2
+
+    def run(self, config=None, telemetry_dir=None):
+        """
+        Run one event-driven simulation and return an EventSimulationResult.
+
+        telemetry_dir: folder for memory-mapped .npy channels (None -> logs stay in memory)
+        """
+        if config is None:
+            config = SimulationConfig()
+
+        dt = config.dt
+        steps = config.steps
+        end_time = steps * dt
+        gps_period = config.gps_period
+
+        plant, imu, gps, kalman, timing_rng = self._build(config)
+        scheduler = EventScheduler()
+
+        # IMU-rate logs (NaN where no sample)
+        telemetry = TelemetryRecorder(SENSOR_FUSION_SCHEMA, steps, path=telemetry_dir)
+        x_true = telemetry.channel("x_true")
+        y_true = telemetry.channel("y_true")
+        x_gps = telemetry.channel("x_gps")
+        y_gps = telemetry.channel("y_gps")
+        x_imu = telemetry.channel("x_imu")
+        y_imu = telemetry.channel("y_imu")
+        x_est = telemetry.channel("x_est")
+        y_est = telemetry.channel("y_est")
+        bias_est_x = telemetry.channel("bias_est_x")
+        bias_est_y = telemetry.channel("bias_est_y")
+
+        # per-fix logs (jitter can add at most one extra fix at the end)
+        gps_capacity = int(end_time / gps_period) + 2
+        gps_stamp = np.empty(gps_capacity)
+        gps_arrival = np.empty(gps_capacity)
+        gps_fix_x = np.empty(gps_capacity)
+        gps_fix_y = np.empty(gps_capacity)
+
+        k = 0
+        n_fix = 0
+        n_dropped = 0
+        last_stamp = -np.inf
+        ax_measure = ay_measure = 0.0
+        imu_x = imu_y = 0.0
+        imu_vx = imu_vy = 0.0
+
+        def on_imu(t):
+            nonlocal ax_measure, ay_measure
+            x_true[k] = plant.x
+            y_true[k] = plant.y
+
+            ax_measure, ay_measure = imu.measure(0, 0)
+            kalman.predict(ax_measure, ay_measure)
+
+        def on_gps_sample(t):
+            # the fix sees the plant now, the filter only gets it after the delay
+            z_gps_x, z_gps_y = gps.sample(plant.x, plant.y)
+
+            latency = config.gps_delay
+            if config.gps_delay_std > 0:
+                latency = max(latency + timing_rng.normal(0.0, config.gps_delay_std), 0.0)
+
+            scheduler.schedule(t + latency,
+                               lambda arrival: on_gps_arrival(t, arrival, z_gps_x, z_gps_y),
+                               self.GPS_PRIORITY)
+
+        def on_gps_arrival(stamp, arrival, z_gps_x, z_gps_y):
+            nonlocal n_fix, n_dropped, last_stamp
+            if k >= steps or n_fix >= gps_capacity:
+                return
+
+            # overtaken by a newer fix: its information is already out of date
+            if stamp <= last_stamp:
+                n_dropped += 1
+                return
+            last_stamp = stamp
+
+            kalman.update_gps(z_gps_x, z_gps_y)
+
+            x_gps[k] = z_gps_x
+            y_gps[k] = z_gps_y
+            gps_stamp[n_fix] = stamp
+            gps_arrival[n_fix] = arrival
+            gps_fix_x[n_fix] = z_gps_x
+            gps_fix_y[n_fix] = z_gps_y
+            n_fix += 1
+
+        def on_control(t):
+            nonlocal k, imu_x, imu_y, imu_vx, imu_vy
+            x_est[k] = kalman.x_hat[0]
+            y_est[k] = kalman.x_hat[1]
+
+            # IMU-only dead reckoning
+            imu_vx += ax_measure * dt
+            imu_vy += ay_measure * dt
+            imu_x += imu_vx * dt
+            imu_y += imu_vy * dt
+            x_imu[k] = imu_x
+            y_imu[k] = imu_y
+
+            # PD control law, then advance the plant to the next IMU tick
+            ax_command = config.kp * (config.x_desired - kalman.x_hat[0]) - config.kd * kalman.x_hat[2]
+            ay_command = config.kp * (config.y_desired - kalman.x_hat[1]) - config.kd * kalman.x_hat[3]
+            plant.step(ax_command, ay_command)
+
+            bias_est_x[k] = kalman.x_hat[4]
+            bias_est_y[k] = kalman.x_hat[5]
+            k += 1
+
+        scheduler.every(dt, on_imu, priority=self.IMU_PRIORITY, stop=end_time)
+        scheduler.every(dt, on_control, priority=self.CONTROL_PRIORITY, stop=end_time)
+
+        # first fix one GPS period after start, on the step before it (like GPSSensor's counter)
+        scheduler.every(gps_period, on_gps_sample, start=max(gps_period - dt, 0.0),
+                        priority=self.GPS_PRIORITY, stop=end_time,
+                        jitter_std=config.gps_jitter_std, rng=timing_rng)
+
+        events = scheduler.run(until=end_time)
+
+        telemetry.channel("time")[:] = np.arange(steps) * dt
+        telemetry.length = steps
+        telemetry.flush()
+
+        return EventSimulationResult(
+            config=config,
+            **telemetry.to_dict(),
+            gps_stamp=gps_stamp[:n_fix], gps_arrival=gps_arrival[:n_fix],
+            gps_fix_x=gps_fix_x[:n_fix], gps_fix_y=gps_fix_y[:n_fix],
+            gps_dropped=n_dropped, events=events,
+        )
+
+def plot_result(result, name, tag, out_dir=DEFAULT_OUT, show=False):
+    """
+    Save the x / y / bias plots of a run (optional stage, matplotlib is only imported here).
+
+    result: SimulationResult
+    name: GPS setup used in titles, e.g. "Fast GPS"
+    tag: file name suffix, e.g. "fast_gps" -> x_fast_gps.png
+    out_dir: output folder
+    show: open the figures after saving (blocking)
+    """
+    from matplotlib import pyplot as plt
+
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    time = result.time
+    interval_s = result.config.gps_update_interval * result.config.dt
+    paths = []
+
+    for axis in ("x", "y"):
+        true_pos = getattr(result, f"{axis}_true")
+        imu_pos = getattr(result, f"{axis}_imu")
+        est_pos = getattr(result, f"{axis}_est")
+        gps_pos = getattr(result, f"{axis}_gps")
+        label = axis.upper()
+
+        plt.figure(figsize=(10, 5))
+        plt.plot(time, true_pos, label=f"{label} True Position")
+        plt.plot(time, imu_pos, label=f"{label} IMU Position")
+        plt.plot(time, est_pos, label=f"{label} estimated position from kalman")
+        plt.plot(time, gps_pos, '.', alpha=0.4, label=f"{label} GPS (update interval = {interval_s:g}s) Position")
+        plt.xlabel("Time (s)")
+        plt.ylabel("Position")
+        plt.title(f"{label} plot of true vs IMU vs {name} vs kalman estimated position")
+        plt.legend()
+        plt.grid()
+
+        out_path = out_dir / f"{axis}_{tag}.png"
+        plt.savefig(out_path, dpi=300)
+        paths.append(out_path)
+
+    # both x and Y bias plot
+    plt.figure(figsize=(10, 5))
+    plt.plot(time, result.bias_est_x, label="Estimated Bias")
+    plt.plot(time, result.bias_est_y, label="Estimated Bias")
+    plt.xlabel("Time (s)")
+    plt.ylabel("m/s^2")
+    plt.title(f"Estimated bias over time with {name}")
+    plt.legend()
+    plt.grid()
+
+    out_path = out_dir / f"bias_{tag}.png"
+    plt.savefig(out_path, dpi=300)
+    paths.append(out_path)
+
+    if show:
+        plt.show()
+    plt.close("all")
+
+    return paths
@@ -0,0 +1,171 @@
+import argparse
+import csv
+import itertools
+import zlib
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import replace
+from pathlib import Path
+
+import numpy as np
+from config import SimulationConfig
+from monte_carlo import run_monte_carlo
+
+PROJECT_NAME = "Sensor_Fusion"
+DEFAULT_OUT = Path(f"data/robotics/{PROJECT_NAME}/sweep.csv")
+
+# GPS rate / noise / filter tuning / PD gain grid (any SimulationConfig field can be swept)
+DEFAULT_GRID = {
+    "gps_update_interval": [1, 5, 10, 25, 50],
+    "imu_noise_std": [0.01, 0.05, 0.1],
+    "Q_imu": [0.001, 0.01, 0.1],
+    "R_gps": [0.5, 1.0, 2.0],
+    "kp": [0.05, 0.1, 0.2],
+    "kd": [0.05, 0.1],
+}
+
+def expand_grid(grid):
+    """
+    Turn {field: [values]} into a list of {field: value} points (cartesian product).
+    """
+    names = list(grid)
+    return [dict(zip(names, values)) for values in itertools.product(*(grid[name] for name in names))]
+
+def config_key(params):
+    """
+    Stable text key of a grid point, used to skip finished points on resume.
+    """
+    return "|".join(f"{name}={params[name]!r}" for name in sorted(params))
+
+def config_seed(base_seed, key):
+    """
+    Deterministic seed of a grid point: same base seed + same point -> same random stream,
+    whichever worker runs it and in whatever order.
+    """
+    return np.random.SeedSequence([base_seed, zlib.crc32(key.encode())])
+
+def evaluate_point(params, base_config, n_trials, base_seed, bias_tol):
+    """
+    Worker: run the Monte-Carlo trials of one grid point and return a flat result row.
+    """
+    key = config_key(params)
+    config = replace(base_config, **params)
+    stats = run_monte_carlo(n_trials, config, seed=config_seed(base_seed, key), bias_tol=bias_tol)
+
+    row = {"key": key, **params, "n_trials": n_trials}
+    for name, value in stats.items():
+        # keep the summary statistics, per-trial arrays are dropped
+        if np.ndim(value) == 0 and name != "n_trials":
+            row[name] = float(value)
+    return row
+
+def load_done_keys(out_path):
+    """
+    Keys of grid points already written to out_path (incomplete trailing rows are ignored).
+    """
+    out_path = Path(out_path)
+    if not out_path.exists():
+        return set()
+
+    with open(out_path, newline="") as f:
+        reader = csv.DictReader(f)
+        last_column = reader.fieldnames[-1] if reader.fieldnames else None
+        return {row["key"] for row in reader if last_column and row.get(last_column) not in (None, "")}
+
+def run_sweep(grid, out_path=DEFAULT_OUT, n_trials=200, base_config=None, seed=0,
+              max_workers=None, bias_tol=0.01):
+    """
+    Evaluate every grid point on a process pool and stream the rows into one CSV file.
+
+    grid: {SimulationConfig field: [values]}
+    out_path: CSV output, one column per parameter / statistic, one row per grid point
+    n_trials: Monte-Carlo trials per grid point
+    base_config: SimulationConfig for the fields not in the grid
+    seed: base seed, each grid point derives its own generator from it
+    max_workers: process count (default: one per CPU)
+
+    Re-running with the same arguments resumes: points already in out_path are skipped.
+    Resuming into a file whose columns do not match this sweep raises ValueError.
+    Returns the number of newly evaluated points.
+    """
+    if base_config is None:
+        base_config = SimulationConfig()
+
+    out_path = Path(out_path)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+
+    # drop a row cut off by an interruption first, so it is re-run instead of counted as done
+    _truncate_partial_row(out_path)
+    header = _read_header(out_path)
+    new_file = header is None
+
+    # rows start with key, the grid fields and n_trials; the statistics columns are checked on the first row
+    prefix = ["key", *grid, "n_trials"]
+    if not new_file and header[:len(prefix)] != prefix:
+        raise ValueError(f"{out_path} has columns {header}, expected them to start with {prefix}; "
+                         "not resuming into a different sweep")
+
+    points = expand_grid(grid)
+    done = load_done_keys(out_path)
+    pending = [p for p in points if config_key(p) not in done]
+    print(f"sweep: {len(points)} points, {len(points) - len(pending)} already done, {len(pending)} to run")
+
+    if not pending:
+        return 0
+
+    written = 0
+    with open(out_path, "a", newline="") as f, ProcessPoolExecutor(max_workers=max_workers) as pool:
+        futures = [pool.submit(evaluate_point, p, base_config, n_trials, seed, bias_tol) for p in pending]
+        writer = None
+
+        for future in as_completed(futures):
+            row = future.result()
+
+            if writer is None:
+                if not new_file and list(row) != header:
+                    pool.shutdown(wait=False, cancel_futures=True)
+                    raise ValueError(f"{out_path} has columns {header}, this sweep writes {list(row)}; "
+                                     "not resuming into a different sweep")
+                writer = csv.DictWriter(f, fieldnames=list(row))
+                if new_file:
+                    writer.writeheader()
+
+            # flush every row so an interrupted sweep keeps everything finished so far
+            writer.writerow(row)
+            f.flush()
+            written += 1
+
+    print(f"sweep: wrote {written} rows -> {out_path}")
+    return written
+
+def _truncate_partial_row(out_path):
+    """
+    Cut the file back to its last complete line.
+    """
+    if not out_path.exists():
+        return
+
+    data = out_path.read_bytes()
+    if data and not data.endswith(b"\n"):
+        out_path.write_bytes(data[:data.rfind(b"\n") + 1])
+
+def _read_header(out_path):
+    """
+    Column names of an existing CSV, or None for a missing / empty file.
+    """
+    if not out_path.exists() or out_path.stat().st_size == 0:
+        return None
+
+    with open(out_path, newline="") as f:
+        return next(csv.reader(f), None)
+
+def get_args():
+    p = argparse.ArgumentParser(description="Sensor-fusion parameter sweep")
+    p.add_argument("--out", type=Path, default=DEFAULT_OUT, help="Output CSV (resumed if it exists)")
+    p.add_argument("--trials", type=int, default=200, help="Monte-Carlo trials per grid point")
+    p.add_argument("--workers", type=int, default=None, help="Worker processes (default: all CPUs)")
+    p.add_argument("--seed", type=int, default=0, help="Base random seed")
+    return p.parse_args()
+
+if __name__ == "__main__":
+    args = get_args()
+    run_sweep(DEFAULT_GRID, args.out, n_trials=args.trials, seed=args.seed, max_workers=args.workers)
@@ -0,0 +1,127 @@
+import json
+from pathlib import Path
+
+import numpy as np
+
+# per-step channels logged by the sensor-fusion simulations
+SENSOR_FUSION_SCHEMA = {
+    "time": np.float64,
+    "x_true": np.float64,
+    "y_true": np.float64,
+    "x_gps": np.float64,
+    "y_gps": np.float64,
+    "x_imu": np.float64,
+    "y_imu": np.float64,
+    "x_est": np.float64,
+    "y_est": np.float64,
+    "bias_est_x": np.float64,
+    "bias_est_y": np.float64,
+}
+
+class TelemetryRecorder:
+    """
+    Fixed-schema, columnar telemetry log.
+
+    Every channel is one preallocated typed array (float channels start as
+    NaN, so samples that never arrive stay NaN instead of None). With `path`
+    set, every channel is a memory-mapped .npy file in that folder, so runs
+    larger than RAM are paged to disk by the OS.
+
+    schema: {channel name: numpy dtype}
+    capacity: number of rows to preallocate
+    path: folder for memory-mapped channels (None -> in memory)
+    """
+
+    def __init__(self, schema, capacity, path=None):
+        self.schema = {name: np.dtype(dtype) for name, dtype in schema.items()}
+        self.capacity = capacity
+        self.path = None if path is None else Path(path)
+        self.length = 0
+
+        if self.path is not None:
+            self.path.mkdir(parents=True, exist_ok=True)
+
+        self._channels = {name: self._allocate(name, dtype, capacity) for name, dtype in self.schema.items()}
+
+    def _allocate(self, name, dtype, capacity):
+        fill = np.nan if dtype.kind == "f" else 0
+
+        if self.path is None:
+            return np.full(capacity, fill, dtype=dtype)
+
+        array = np.lib.format.open_memmap(self.path / f"{name}.npy", mode="w+", dtype=dtype, shape=(capacity,))
+        array[:] = fill
+        return array
+
+    def channel(self, name):
+        """
+        Full preallocated array of a channel (write into it by index for the fastest logging).
+        """
+        return self._channels[name]
+
+    def __getitem__(self, name):
+        """
+        Recorded part of a channel (a view, no copy).
+        """
+        return self._channels[name][:self.length]
+
+    def record(self, **values):
+        """
+        Append one row; channels left out stay NaN (or 0 for integer channels).
+        """
+        row = self.length
+        if row >= self.capacity:
+            self._grow()
+
+        for name, value in values.items():
+            if name not in self._channels:
+                raise KeyError(f"{name} is not in the telemetry schema. Channels are {', '.join(self.schema)}")
+            self._channels[name][row] = value
+
+        self.length = row + 1
+
+    def _grow(self):
+        """
+        Double the capacity of in-memory logs (memory-mapped logs are sized up front).
+        """
+        if self.path is not None:
+            raise IndexError(f"memory-mapped telemetry is full ({self.capacity} rows)")
+
+        new_capacity = max(1, 2 * self.capacity)
+        for name, dtype in self.schema.items():
+            grown = self._allocate(name, dtype, new_capacity)
+            grown[:self.capacity] = self._channels[name]
+            self._channels[name] = grown
+        self.capacity = new_capacity
+
+    def to_dict(self):
+        """
+        {channel name: recorded array}
+        """
+        return {name: self[name] for name in self.schema}
+
+    def flush(self):
+        """
+        Write memory-mapped channels to disk together with a small metadata file.
+        """
+        if self.path is None:
+            return
+
+        for array in self._channels.values():
+            array.flush()
+
+        meta = {"length": self.length, "schema": {name: dtype.str for name, dtype in self.schema.items()}}
+        with open(self.path / "telemetry.json", "w") as f:
+            json.dump(meta, f, indent=4)
+
+    @staticmethod
+    def load(path):
+        """
+        Open a flushed telemetry folder read-only: {channel name: memory-mapped array}.
+        """
+        path = Path(path)
+        with open(path / "telemetry.json") as f:
+            meta = json.load(f)
+
+        length = meta["length"]
+        return {name: np.load(path / f"{name}.npy", mmap_mode="r")[:length] for name in meta["schema"]}
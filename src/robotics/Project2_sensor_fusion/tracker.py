@@ -0,0 +1,330 @@
+import numpy as np
+
+from nonlinear import ConstantVelocityModel, ExtendedKalmanFilterBank
+
+# cost of a track / measurement pair that is outside the gate (never kept)
+_NO_PAIR = 1e12
+
+
+class MultiTargetTracker:
+    """
+    Global-nearest-neighbour tracker for many targets seen through one position stream.
+
+    Tracks live in one ExtendedKalmanFilterBank (constant velocity model, state
+    [x, y, vx, vy]). Each step:
+        1. predict every track
+        2. gate: a uniform grid over the measurements finds the candidates near
+           each track, which are then kept if their Mahalanobis distance passes
+           the chi-square gate
+        3. assign: the gated pairs split into independent clusters, each solved
+           with the Hungarian algorithm (clusters around a single track or
+           measurement just take their closest pair)
+        4. correct assigned tracks, start a tentative track for every unassigned
+           measurement and drop tracks that missed too many scans
+
+    Only gated pairs are ever built, so a step costs about O((N + M) log M)
+    instead of comparing every track with every measurement.
+    """
+
+    def __init__(self, dt, accel_var=1.0, R_gps=1.0, gate_probability=0.99,
+                 velocity_var=10.0, confirm_hits=3, max_misses=3):
+        self.bank = ExtendedKalmanFilterBank(ConstantVelocityModel(accel_var), dt,
+                                             np.empty((0, 4)), np.eye(4), R_gps=R_gps)
+
+        # chi-square quantile for 2 degrees of freedom has a closed form
+        self.gate = -2.0 * np.log(1.0 - gate_probability)
+
+        # new tracks start at the measurement with unknown velocity
+        R = self.bank.gps.R
+        self.P_birth = np.zeros((4, 4))
+        self.P_birth[:2, :2] = R
+        self.P_birth[2, 2] = self.P_birth[3, 3] = velocity_var
+
+        self.confirm_hits = confirm_hits
+        self.max_misses = max_misses
+
+        # per-track bookkeeping, kept in the same row order as the bank
+        self.ids = np.empty(0, dtype=np.int64)
+        self.hits = np.empty(0, dtype=np.int64)
+        self.misses = np.empty(0, dtype=np.int64)
+        self._next_id = 0
+
+    def __len__(self):
+        return len(self.bank)
+
+    @property
+    def states(self):
+        return self.bank.x_hat
+
+    @property
+    def confirmed(self):
+        return self.hits >= self.confirm_hits
+
+    def step(self, z):
+        """
+        Run one scan of position measurements z (M, 2).
+
+        Returns (track_ids, measurement_idx): which track each used measurement was assigned to.
+        """
+        z = np.asarray(z, dtype=float).reshape(-1, 2)
+
+        self.bank.predict()
+        tracks, meas = self.associate(z)
+        assigned_ids = self.ids[tracks]
+
+        # correct assigned tracks
+        n = len(self.bank)
+        mask = np.zeros(n, dtype=bool)
+        mask[tracks] = True
+        z_tracks = np.zeros((n, 2))
+        z_tracks[tracks] = z[meas]
+        self.bank.update(z_tracks, self.bank.gps, mask)
+
+        self.hits[mask] += 1
+        self.misses[mask] = 0
+        self.misses[~mask] += 1
+
+        # death: confirmed tracks may coast for max_misses scans, tentative ones not at all
+        keep = (self.misses <= self.max_misses) & (self.confirmed | (self.misses == 0))
+        if not keep.all():
+            self._select(keep)
+
+        # birth: every measurement no track claimed
+        free = np.ones(z.shape[0], dtype=bool)
+        free[meas] = False
+        if free.any():
+            self._spawn(z[free])
+
+        return assigned_ids, meas
+
+    def associate(self, z):
+        """
+        Gate and assign measurements z (M, 2) to the current (predicted) tracks.
+
+        Returns (track_idx, measurement_idx) arrays of the assigned pairs.
+        """
+        empty = np.empty(0, dtype=np.int64)
+        if len(self.bank) == 0 or z.shape[0] == 0:
+            return empty, empty
+
+        # predicted measurement and innovation covariance of every track
+        x = self.bank.x_hat
+        gps = self.bank.gps
+        H = gps.jacobian(x)
+        S = H @ self.bank.P @ np.swapaxes(H, 1, 2) + gps.R
+
+        t, m, d2 = gate_candidates(gps.h(x), S, z, self.gate)
+        if t.size == 0:
+            return empty, empty
+
+        return _assign(t, m, d2, len(self.bank), z.shape[0])
+
+    def _select(self, keep):
+        self.bank.select(keep)
+        self.ids = self.ids[keep]
+        self.hits = self.hits[keep]
+        self.misses = self.misses[keep]
+
+    def _spawn(self, z):
+        k = z.shape[0]
+        x0 = np.zeros((k, 4))
+        x0[:, :2] = z
+        self.bank.append(x0, self.P_birth)
+
+        self.ids = np.concatenate([self.ids, np.arange(self._next_id, self._next_id + k)])
+        self.hits = np.concatenate([self.hits, np.ones(k, dtype=np.int64)])
+        self.misses = np.concatenate([self.misses, np.zeros(k, dtype=np.int64)])
+        self._next_id += k
+
+
+def gate_candidates(z_pred, S, z, gate):
+    """
+    Track / measurement pairs inside the Mahalanobis gate, found through a uniform grid.
+
+    z_pred: (N, 2) predicted positions, S: (N, 2, 2) innovation covariances, z: (M, 2)
+    Returns (track_idx, measurement_idx, d2) of the pairs with d2 <= gate.
+
+    Measurements are bucketed into square cells and sorted by cell key. Each
+    track then looks up only the cells its gate ellipse can reach (a binary
+    search per cell), so the work grows with the number of close pairs, not N * M.
+    """
+    a = S[:, 0, 0]
+    b = S[:, 0, 1]
+    d = S[:, 1, 1]
+
+    # gate ellipse fits in a circle of radius sqrt(gate * largest eigenvalue of S)
+    lam_max = 0.5 * (a + d) + np.sqrt(0.25 * (a - d)**2 + b * b)
+    radius = np.sqrt(gate * lam_max)
+
+    # cell about the typical gate size; a few very uncertain tracks just span more cells
+    cell = max(np.median(radius), radius.max() / 4.0)
+    span = np.ceil(radius / cell).astype(np.int64)
+
+    m_cell = np.floor(z / cell).astype(np.int64)
+    m_key = _cell_key(m_cell[:, 0], m_cell[:, 1])
+    order = np.argsort(m_key, kind="stable")
+    m_key = m_key[order]
+
+    t_cell = np.floor(z_pred / cell).astype(np.int64)
+
+    t_parts = []
+    m_parts = []
+    k_max = int(span.max())
+    for dx in range(-k_max, k_max + 1):
+        for dy in range(-k_max, k_max + 1):
+            tracks = np.flatnonzero(span >= max(abs(dx), abs(dy)))
+            key = _cell_key(t_cell[tracks, 0] + dx, t_cell[tracks, 1] + dy)
+
+            lo = np.searchsorted(m_key, key, side="left")
+            count = np.searchsorted(m_key, key, side="right") - lo
+            total = count.sum()
+            if total == 0:
+                continue
+
+            # expand each track's [lo, lo + count) range of sorted measurements
+            start = np.repeat(lo, count)
+            offset = np.arange(total) - np.repeat(np.cumsum(count) - count, count)
+            t_parts.append(np.repeat(tracks, count))
+            m_parts.append(order[start + offset])
+
+    if not t_parts:
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty, np.empty(0)
+
+    t = np.concatenate(t_parts)
+    m = np.concatenate(m_parts)
+
+    # squared Mahalanobis distance y^T S^-1 y with the 2x2 inverse in closed form
+    y0 = z[m, 0] - z_pred[t, 0]
+    y1 = z[m, 1] - z_pred[t, 1]
+    det = a[t] * d[t] - b[t] * b[t]
+    d2 = (d[t] * y0 * y0 - 2.0 * b[t] * y0 * y1 + a[t] * y1 * y1) / det
+
+    inside = d2 <= gate
+    return t[inside], m[inside], d2[inside]
+
+
+def _cell_key(cx, cy):
+    """
+    One int64 key per grid cell (cells within +-2^31 on each axis).
+    """
+    return (cx << 32) + cy
+
+
+def _assign(t, m, d2, n_tracks, n_meas):
+    """
+    Min-cost assignment on the sparse gated pairs, one Hungarian problem per cluster.
+    """
+    # clusters = connected components of the track-measurement graph (min-label propagation)
+    label_t = np.arange(n_tracks)
+    label_m = np.arange(n_tracks, n_tracks + n_meas)
+    while True:
+        pair_label = np.minimum(label_t[t], label_m[m])
+        new_t = label_t.copy()
+        new_m = label_m.copy()
+        np.minimum.at(new_t, t, pair_label)
+        np.minimum.at(new_m, m, pair_label)
+        if np.array_equal(new_t, label_t) and np.array_equal(new_m, label_m):
+            break
+        label_t, label_m = new_t, new_m
+
+    _, cluster = np.unique(pair_label, return_inverse=True)
+
+    # pairs grouped by cluster, best (smallest d2) first inside each cluster
+    order = np.lexsort((d2, cluster))
+    starts = np.flatnonzero(np.r_[True, np.diff(cluster[order]) != 0])
+    t_sorted = t[order]
+    m_sorted = m[order]
+
+    # a cluster around a single track or a single measurement (incl. a lone pair)
+    # has nothing to resolve: its closest pair wins
+    star = ((np.minimum.reduceat(t_sorted, starts) == np.maximum.reduceat(t_sorted, starts))
+            | (np.minimum.reduceat(m_sorted, starts) == np.maximum.reduceat(m_sorted, starts)))
+    t_out = [t_sorted[starts[star]]]
+    m_out = [m_sorted[starts[star]]]
+
+    bounds = np.r_[starts, order.size]
+    for k in np.flatnonzero(~star):
+        pairs = order[bounds[k]:bounds[k + 1]]
+        rows, t_local = np.unique(t[pairs], return_inverse=True)
+        cols, m_local = np.unique(m[pairs], return_inverse=True)
+
+        cost = np.full((rows.size, cols.size), _NO_PAIR)
+        cost[t_local, m_local] = d2[pairs]
+
+        if rows.size <= cols.size:
+            r = np.arange(rows.size)
+            c = _hungarian(cost)
+        else:
+            c = np.arange(cols.size)
+            r = _hungarian(cost.T)
+
+        ok = cost[r, c] < _NO_PAIR
+        t_out.append(rows[r[ok]])
+        m_out.append(cols[c[ok]])
+
+    return np.concatenate(t_out), np.concatenate(m_out)
+
+
+def _hungarian(cost):
+    """
+    Minimum-cost assignment for an (n, m) cost matrix with n <= m (shortest augmenting paths).
+
+    Returns the column assigned to each row. O(n^2 m); clusters are small, so this
+    runs on plain Python lists, which beats NumPy call overhead at these sizes.
+    """
+    n, m = cost.shape
+    a = cost.tolist()
+    inf = float("inf")
+
+    u = [0.0] * (n + 1)
+    v = [0.0] * (m + 1)
+    p = [0] * (m + 1)      # p[j]: row (1-based) matched to column j, 0 = free
+    way = [0] * (m + 1)
+
+    for i in range(1, n + 1):
+        p[0] = i
+        j0 = 0
+        minv = [inf] * (m + 1)
+        used = [False] * (m + 1)
+
+        # grow a shortest alternating path from row i until it reaches a free column
+        while True:
+            used[j0] = True
+            i0 = p[j0]
+            row = a[i0 - 1]
+            ui0 = u[i0]
+            delta = inf
+            j1 = 0
+            for j in range(1, m + 1):
+                if not used[j]:
+                    cur = row[j - 1] - ui0 - v[j]
+                    if cur < minv[j]:
+                        minv[j] = cur
+                        way[j] = j0
+                    if minv[j] < delta:
+                        delta = minv[j]
+                        j1 = j
+
+            for j in range(m + 1):
+                if used[j]:
+                    u[p[j]] += delta
+                    v[j] -= delta
+                else:
+                    minv[j] -= delta
+
+            j0 = j1
+            if p[j0] == 0:
+                break
+
+        # flip the path
+        while j0:
+            j1 = way[j0]
+            p[j0] = p[j1]
+            j0 = j1
+
+    assignment = np.empty(n, dtype=np.int64)
+    for j in range(1, m + 1):
+        if p[j]:
+            assignment[p[j] - 1] = j - 1
+    return assignment
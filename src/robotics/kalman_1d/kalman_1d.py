@@ -1,5 +1,14 @@
+import sys
+from pathlib import Path
+
 import numpy as np
 
+# helpers shared with the other projects live in src/robotics/robotics_common
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from robotics_common.riccati import solve_dare
+
+COVARIANCE_FORMS = ("standard", "sqrt")
+
 class KalmanFilterPosVel:
     """
     1D Kalman Filter with state = [position, velocity]^T
@@ -11,14 +20,23 @@ class KalmanFilterPosVel:
                  initial_velocity: float,
                  initial_uncertainty: float,
                  accel_variance: float,
-                 measurement_variance: float):
+                 measurement_variance: float,
+                 covariance_form: str = "standard",
+                 dtype=np.float64):
+
+        if covariance_form not in COVARIANCE_FORMS:
+            raise ValueError(f"covariance_form must be one of {COVARIANCE_FORMS}, got {covariance_form!r}")
 
         self.dt = dt
 
+        # "standard" keeps P itself, "sqrt" keeps a Cholesky factor S with P = S S^T
+        self.covariance_form = covariance_form
+        self.dtype = np.dtype(dtype)
+
         # State vector [pos, vel]
         # "At any moment, I believe the system is at position x and veocity v"
         self.x = np.array([[initial_position],
-                           [initial_velocity]], dtype=float)
+                           [initial_velocity]], dtype=self.dtype)
 
         # State covariance (uncertainty)
         # "How sure am I about positions and velocity?"
@@ -26,29 +44,112 @@ class KalmanFilterPosVel:
 
         # State transition matrix (constant velocity model)
         self.F = np.array([[1.0, dt],
-                           [0.0, 1.0]], dtype=float)
+                           [0.0, 1.0]], dtype=self.dtype)
 
         # Measurement matrix (we measure position only)
-        self.H = np.array([[1.0, 0.0]], dtype=float)
+        self.H = np.array([[1.0, 0.0]], dtype=self.dtype)
 
         # Measurement noise covariance
-        self.R = np.array([[measurement_variance]], dtype=float)
+        self.R = np.array([[measurement_variance]], dtype=self.dtype)
 
         # Process noise covariance (how much acceleration uncertainty you expect)
         # Asuming acceleration exists, but I don't model it explicitly -> treat acceleration as a noise.
-        q = accel_variance
-        dt2 = dt * dt
-        dt3 = dt2 * dt
-        dt4 = dt2 * dt2
-        self.Q = q * np.array([[dt4 / 4.0, dt3 / 2.0],
-                               [dt3 / 2.0, dt2]], dtype=float)
+        self.Q = _process_noise(dt, accel_variance, self.dtype)
+
+        self.I = np.eye(2, dtype=self.dtype)
+
+        # Steady-state mode (see enable_steady_state), None = full Kalman recursion
+        self._steady = None
+
+        # sqrt form: entries of a square root of Q, cached for the Q array they came from
+        self._Q_sqrt = None
+
+    @property
+    def P(self):
+        """
+        State covariance. In sqrt form it is rebuilt from the factor (S S^T) on each access.
+        """
+        if self.covariance_form == "sqrt":
+            return self.S @ self.S.T
+        return self._P
+
+    @P.setter
+    def P(self, value):
+        value = np.asarray(value, dtype=self.dtype)
+        if self.covariance_form == "sqrt":
+            self.S = np.linalg.cholesky(value)
+        else:
+            self._P = value
+
+    def enable_steady_state(self, tol: float = 1e-12, max_iter: int = 100_000):
+        """
+        Switch to a precomputed steady-state gain.
+
+        F, H, Q, R are constant, so P converges to the fixed point of the discrete
+        algebraic Riccati equation. Solve it once, cache K_inf, and from then on
+        predict/update only move the state (a few multiply-adds, P stays at P_inf).
+
+        Reassigning F, H, Q or R switches the filter back to the full recursion;
+        while the mode is on the four arrays are read-only so they cannot drift
+        from the cached gain.
+        """
+        if self.H.shape[0] != 1:
+            raise ValueError("steady-state mode needs a scalar (single-row H) measurement")
+
+        P_pred, K = solve_dare(self.F, self.H, self.Q, self.R, self.P, tol, max_iter)
+
+        # filter now sits at its steady-state (posterior) covariance
+        self.P = (self.I - K @ self.H) @ P_pred
+
+        sources = (self.F, self.H, self.Q, self.R)
+        for array in sources:
+            array.flags.writeable = False
 
-        self.I = np.eye(2)
+        self._steady = (*self.F.ravel().tolist(), *K.ravel().tolist(), *self.H.ravel().tolist(), sources)
+
+    def disable_steady_state(self):
+        """
+        Go back to the full predict/update recursion (P evolves again from P_inf).
+        """
+        if self._steady is not None:
+            for array in self._steady[-1]:
+                array.flags.writeable = True
+        self._steady = None
+
+    def _steady_active(self) -> bool:
+        """
+        True while steady-state mode is on and F, H, Q, R are still the arrays it was solved for.
+        """
+        if self._steady is None:
+            return False
+
+        F, H, Q, R = self._steady[-1]
+        if self.F is F and self.H is H and self.Q is Q and self.R is R:
+            return True
+
+        # parameters changed -> cached gain is stale
+        self.disable_steady_state()
+        return False
 
     def predict(self):
+        if self._steady_active():
+            # x = F x with the cached F entries; P stays at P_inf
+            f00, f01, f10, f11 = self._steady[:4]
+            x0, x1 = self.x.ravel().tolist()
+            self.x[0, 0] = f00 * x0 + f01 * x1
+            self.x[1, 0] = f10 * x0 + f11 * x1
+            return self.x
+
         # x = F x
         self.x = self.F @ self.x
 
+        if self.covariance_form == "sqrt":
+            # S = triangular factor of [F S | Q^1/2]  ->  S S^T = F P F^T + Q
+            F = tuple(self.F.ravel().tolist())
+            S = tuple(self.S.ravel().tolist())
+            self.S.ravel()[:] = _sqrt_predict(F, S, self._process_noise_sqrt())
+            return self.x
+
         # P = F P F^T + Q
         self.P = self.F @ self.P @ self.F.T + self.Q
 
@@ -58,6 +159,22 @@ class KalmanFilterPosVel:
         """
         z: scalar position measurement
         """
+        if self._steady_active():
+            # x = x + K_inf (z - H x)
+            k0, k1, h0, h1 = self._steady[4:8]
+            x0, x1 = self.x.ravel().tolist()
+            y = z - (h0 * x0 + h1 * x1)
+            self.x[0, 0] = x0 + k0 * y
+            self.x[1, 0] = x1 + k1 * y
+            return self.x
+
+        if self.covariance_form == "sqrt":
+            return self._update_sqrt(z)
+
+        # single-row H (position only): closed-form scalar update, no matrix inverse
+        if self.H.shape[0] == 1:
+            return self._update_scalar(z)
+
         z = np.array([[z]], dtype=float)
 
         # Innovation / residual - how wrong was my prediction?
@@ -76,3 +193,453 @@ class KalmanFilterPosVel:
 
         return self.x
 
+    def _update_scalar(self, z: float):
+        """
+        Same correction as update() for a scalar measurement, on plain floats.
+
+        S is 1x1 so S^-1 = 1/S; x and P are updated in place (no temporaries).
+        """
+        h0, h1 = self.H.ravel().tolist()
+        p00, p01, p10, p11 = self.P.ravel().tolist()
+        x0, x1 = self.x.ravel().tolist()
+
+        # P H^T and H P
+        pht0 = p00 * h0 + p01 * h1
+        pht1 = p10 * h0 + p11 * h1
+        hp0 = h0 * p00 + h1 * p10
+        hp1 = h0 * p01 + h1 * p11
+
+        # Innovation covariance, Kalman gain and residual
+        S = h0 * pht0 + h1 * pht1 + self.R.item()
+        k0 = pht0 / S
+        k1 = pht1 / S
+        y = z - (h0 * x0 + h1 * x1)
+
+        # Update state and covariance: P = (I - K H) P = P - K (H P)
+        self.x[0, 0] = x0 + k0 * y
+        self.x[1, 0] = x1 + k1 * y
+
+        P = self.P
+        P[0, 0] = p00 - k0 * hp0
+        P[0, 1] = p01 - k0 * hp1
+        P[1, 0] = p10 - k1 * hp0
+        P[1, 1] = p11 - k1 * hp1
+
+        return self.x
+
+    def _update_sqrt(self, z: float):
+        """
+        Potter square-root update of x and the factor S (scalar measurement).
+
+        P is never formed, so it cannot lose symmetry or positive-definiteness.
+        """
+        if self.H.shape[0] != 1:
+            raise ValueError("sqrt covariance form needs a scalar (single-row H) measurement")
+
+        h = tuple(self.H.ravel().tolist())
+        x = tuple(self.x.ravel().tolist())
+        S = tuple(self.S.ravel().tolist())
+
+        x, S = _potter_update(x, S, h, self.R.item(), z)
+
+        self.x.ravel()[:] = x
+        self.S.ravel()[:] = S
+
+        return self.x
+
+    def _process_noise_sqrt(self):
+        """
+        Entries of G with G G^T = Q, recomputed only when Q is reassigned.
+        """
+        if self._Q_sqrt is None or self._Q_sqrt[1] is not self.Q:
+            self._Q_sqrt = (_psd_sqrt(self.Q), self.Q)
+        return self._Q_sqrt[0]
+
+    def smooth(self, measurements):
+        """
+        Rauch-Tung-Striebel smoother over a whole recorded track.
+
+        measurements: array (T,) of position measurements (NaN = missing, predict only)
+
+        Starts from the current x / P (the filter itself is not modified), runs the
+        forward filter into preallocated (T, 2) / (T, 2, 2) arrays, then does the
+        backward pass vectorized over time.
+        Returns (x_smooth (T, 2), P_smooth (T, 2, 2)).
+        """
+        z = np.asarray(measurements, dtype=float)
+        T = z.shape[0]
+
+        x_pred, P_pred, x_filt, P_filt = self._forward_pass(z)
+
+        if T < 2:
+            return x_filt, P_filt
+
+        # Smoother gain C_k = P_filt[k] F^T P_pred[k+1]^-1, for every k at once
+        # (2x2 products written per element on (T-1,) arrays)
+        F = _split(np.broadcast_to(self.F, (T - 1, 2, 2)))
+        Pf = _split(P_filt[:-1])
+        C = _mul(_mul(Pf, _transpose(F)), _inv(_split(P_pred[1:])))
+
+        # x_s[k] = x_filt[k] + C_k (x_s[k+1] - x_pred[k+1])  =  C_k x_s[k+1] + bx_k
+        xp0, xp1 = x_pred[1:, 0], x_pred[1:, 1]
+        bx = (x_filt[:-1, 0] - (C[0] * xp0 + C[1] * xp1),
+              x_filt[:-1, 1] - (C[2] * xp0 + C[3] * xp1))
+
+        # P_s[k] = P_filt[k] + C_k (P_s[k+1] - P_pred[k+1]) C_k^T  =  C_k P_s[k+1] C_k^T + bP_k
+        C_T = _transpose(C)
+        bP = _sub(Pf, _mul(_mul(C, _split(P_pred[1:])), C_T))
+
+        # all T backward steps in log2(T) vectorized passes
+        G, gx, gP = _reverse_scan(C, bx, bP)
+
+        x_last = x_filt[-1]
+        P_last = tuple(P_filt[-1].ravel())
+
+        x_smooth = np.empty((T, 2))
+        x_smooth[:-1, 0] = G[0] * x_last[0] + G[1] * x_last[1] + gx[0]
+        x_smooth[:-1, 1] = G[2] * x_last[0] + G[3] * x_last[1] + gx[1]
+        x_smooth[-1] = x_last
+
+        P_smooth = np.empty((T, 2, 2))
+        GPG = _mul(_mul(G, P_last), _transpose(G))
+        for i, (a, b) in enumerate(zip(GPG, gP)):
+            P_smooth[:-1, i // 2, i % 2] = a + b
+        P_smooth[-1] = P_filt[-1]
+
+        return x_smooth, P_smooth
+
+    def _forward_pass(self, z):
+        """
+        Kalman filter over all measurements on plain floats (predict, then update unless z is NaN).
+
+        Returns predicted and filtered states / covariances: (T, 2), (T, 2, 2), (T, 2), (T, 2, 2).
+        """
+        T = z.shape[0]
+        x_pred = np.empty((T, 2))
+        P_pred = np.empty((T, 2, 2))
+        x_filt = np.empty((T, 2))
+        P_filt = np.empty((T, 2, 2))
+
+        # flat memoryviews: element writes are much cheaper than numpy row assignment
+        xp = memoryview(x_pred.reshape(-1))
+        Pp = memoryview(P_pred.reshape(-1))
+        xf = memoryview(x_filt.reshape(-1))
+        Pf = memoryview(P_filt.reshape(-1))
+
+        f00, f01, f10, f11 = self.F.ravel().tolist()
+        q00, q01, q10, q11 = self.Q.ravel().tolist()
+        h0, h1 = self.H.ravel().tolist()
+        r = self.R.item()
+
+        x0, x1 = self.x.ravel().tolist()
+        p00, p01, p10, p11 = self.P.ravel().tolist()
+
+        for k, zk in enumerate(z.tolist()):
+            # x = F x
+            x0, x1 = f00 * x0 + f01 * x1, f10 * x0 + f11 * x1
+
+            # P = F P F^T + Q
+            a00 = f00 * p00 + f01 * p10
+            a01 = f00 * p01 + f01 * p11
+            a10 = f10 * p00 + f11 * p10
+            a11 = f10 * p01 + f11 * p11
+            p00 = a00 * f00 + a01 * f01 + q00
+            p01 = a00 * f10 + a01 * f11 + q01
+            p10 = a10 * f00 + a11 * f01 + q10
+            p11 = a10 * f10 + a11 * f11 + q11
+
+            i = 2 * k
+            j = 4 * k
+            xp[i] = x0
+            xp[i + 1] = x1
+            Pp[j] = p00
+            Pp[j + 1] = p01
+            Pp[j + 2] = p10
+            Pp[j + 3] = p11
+
+            if zk == zk:  # not NaN
+                pht0 = p00 * h0 + p01 * h1
+                pht1 = p10 * h0 + p11 * h1
+                hp0 = h0 * p00 + h1 * p10
+                hp1 = h0 * p01 + h1 * p11
+
+                S = h0 * pht0 + h1 * pht1 + r
+                k0 = pht0 / S
+                k1 = pht1 / S
+                y = zk - (h0 * x0 + h1 * x1)
+
+                x0 += k0 * y
+                x1 += k1 * y
+                p00, p01, p10, p11 = p00 - k0 * hp0, p01 - k0 * hp1, p10 - k1 * hp0, p11 - k1 * hp1
+
+            xf[i] = x0
+            xf[i + 1] = x1
+            Pf[j] = p00
+            Pf[j + 1] = p01
+            Pf[j + 2] = p10
+            Pf[j + 3] = p11
+
+        return x_pred, P_pred, x_filt, P_filt
+
+class KalmanFilterPosVelBank:
+    """
+    N independent KalmanFilterPosVel filters stored as arrays: x (N, 2), P (N, 2, 2).
+
+    Same predict() / update(z) calls, with one measurement per filter (NaN = no
+    measurement for that filter this step). Initial values may be scalars or
+    per-filter arrays. With covariance_form="sqrt" the bank keeps Cholesky
+    factors S (N, 2, 2) instead of P, which is what makes float32 banks usable
+    over long runs.
+    """
+
+    def __init__(self, n: int, dt: float,
+                 initial_position=0.0,
+                 initial_velocity=0.0,
+                 initial_uncertainty=1.0,
+                 accel_variance=1.0,
+                 measurement_variance=1.0,
+                 covariance_form: str = "standard",
+                 dtype=np.float64):
+
+        if covariance_form not in COVARIANCE_FORMS:
+            raise ValueError(f"covariance_form must be one of {COVARIANCE_FORMS}, got {covariance_form!r}")
+
+        self.n = n
+        self.dt = dt
+        self.covariance_form = covariance_form
+        self.dtype = np.dtype(dtype)
+
+        self.x = np.empty((n, 2), dtype=self.dtype)
+        self.x[:, 0] = initial_position
+        self.x[:, 1] = initial_velocity
+
+        # diagonal initial covariance -> its Cholesky factor is diagonal too
+        p0 = np.broadcast_to(np.asarray(initial_uncertainty, dtype=self.dtype), (n,))
+        cov = np.zeros((n, 2, 2), dtype=self.dtype)
+        if covariance_form == "sqrt":
+            cov[:, 0, 0] = cov[:, 1, 1] = np.sqrt(p0)
+            self.S = cov
+        else:
+            cov[:, 0, 0] = cov[:, 1, 1] = p0
+            self._P = cov
+
+        # Shared model (same constant velocity model as the single filter)
+        self.F = np.array([[1.0, dt],
+                           [0.0, 1.0]], dtype=self.dtype)
+        self.H = np.array([[1.0, 0.0]], dtype=self.dtype)
+        self.R = np.array([[measurement_variance]], dtype=self.dtype)
+        self.Q = _process_noise(dt, accel_variance, self.dtype)
+
+        # sqrt form: entries of a square root of Q, cached for the Q array they came from
+        self._Q_sqrt = None
+
+    @property
+    def P(self):
+        """
+        Covariances (N, 2, 2). In sqrt form they are rebuilt from the factors on each access.
+        """
+        if self.covariance_form == "sqrt":
+            return self.S @ np.swapaxes(self.S, 1, 2)
+        return self._P
+
+    def predict(self):
+        # x = F x
+        f00, f01, f10, f11 = self.F.ravel().tolist()
+        x0, x1 = self.x[:, 0].copy(), self.x[:, 1]
+        self.x[:, 0] = f00 * x0 + f01 * x1
+        self.x[:, 1] = f10 * x0 + f11 * x1
+
+        F = (f00, f01, f10, f11)
+        if self.covariance_form == "sqrt":
+            # S = triangular factor of [F S | Q^1/2]
+            new = _sqrt_predict(F, _split(self.S), self._process_noise_sqrt())
+            target = _split(self.S)
+        else:
+            # P = F P F^T + Q
+            P = _split(self._P)
+            new = tuple(a + q for a, q in zip(_mul(_mul(F, P), _transpose(F)), self.Q.ravel().tolist()))
+            target = P
+
+        for t, v in zip(target, new):
+            t[...] = v
+
+        return self.x
+
+    def _process_noise_sqrt(self):
+        """
+        Entries of G with G G^T = Q, recomputed only when Q is reassigned.
+        """
+        if self._Q_sqrt is None or self._Q_sqrt[1] is not self.Q:
+            self._Q_sqrt = (_psd_sqrt(self.Q), self.Q)
+        return self._Q_sqrt[0]
+
+    def update(self, z):
+        """
+        z: array (N,) of position measurements, NaN = no measurement for that filter
+        """
+        z = np.asarray(z, dtype=self.dtype)
+        has_z = ~np.isnan(z)
+        rows = slice(None) if has_z.all() else np.flatnonzero(has_z)
+
+        h = tuple(self.H.ravel().tolist())
+        r = self.R.item()
+        x = (self.x[rows, 0], self.x[rows, 1])
+        z = z[rows]
+
+        if self.covariance_form == "sqrt":
+            cov = self.S
+            x, C = _potter_update(x, _split(cov[rows]), h, r, z)
+        else:
+            # Same closed-form scalar update as KalmanFilterPosVel: P = P - K (H P)
+            cov = self._P
+            p00, p01, p10, p11 = _split(cov[rows])
+            h0, h1 = h
+            pht0 = p00 * h0 + p01 * h1
+            pht1 = p10 * h0 + p11 * h1
+            hp0 = h0 * p00 + h1 * p10
+            hp1 = h0 * p01 + h1 * p11
+
+            S = h0 * pht0 + h1 * pht1 + r
+            k0 = pht0 / S
+            k1 = pht1 / S
+            y = z - (h0 * x[0] + h1 * x[1])
+
+            x = (x[0] + k0 * y, x[1] + k1 * y)
+            C = (p00 - k0 * hp0, p01 - k0 * hp1, p10 - k1 * hp0, p11 - k1 * hp1)
+
+        self.x[rows, 0] = x[0]
+        self.x[rows, 1] = x[1]
+        for i, c in enumerate(C):
+            cov[rows, i // 2, i % 2] = c
+
+        return self.x
+
+def _process_noise(dt, accel_variance, dtype):
+    """
+    Q for a white acceleration of variance accel_variance over one step dt.
+    """
+    q = accel_variance
+    dt2 = dt * dt
+    dt3 = dt2 * dt
+    dt4 = dt2 * dt2
+    return q * np.array([[dt4 / 4.0, dt3 / 2.0],
+                         [dt3 / 2.0, dt2]], dtype=dtype)
+
+def _psd_sqrt(Q):
+    """
+    Entries of G with G G^T = Q (symmetric eigen-decomposition, so a singular Q is fine).
+    """
+    w, V = np.linalg.eigh(np.asarray(Q, dtype=float))
+    G = V * np.sqrt(np.clip(w, 0.0, None))
+    return tuple(G.ravel().tolist())
+
+# Square-root helpers, on 2x2 entry tuples (a00, a01, a10, a11) of floats or
+# of arrays over a bank, like the smoother helpers below.
+
+def _sqrt_predict(F, S, G):
+    """
+    Lower-triangular L with L L^T = F S S^T F^T + G G^T.
+
+    L is the triangular factor of the 2x4 block [F S | G], taken row by row with
+    Gram-Schmidt (a QR of its transpose), so F P F^T + Q is never formed.
+    """
+    FS = _mul(F, S)
+    a0 = (FS[0], FS[1], G[0], G[1])
+    a1 = (FS[2], FS[3], G[2], G[3])
+
+    n0 = sum(a * a for a in a0)
+    l00 = n0 ** 0.5
+    c = sum(a * b for a, b in zip(a0, a1)) / n0
+
+    # row 1 minus its projection onto row 0
+    l10 = c * l00
+    l11 = sum((b - c * a) ** 2 for a, b in zip(a0, a1)) ** 0.5
+
+    return l00, 0.0 * l00, l10, l11
+
+def _potter_update(x, S, h, r, z):
+    """
+    Potter scalar measurement update of the state x and the factor S (P = S S^T).
+
+    With phi = S^T h and alpha = h P h^T + r:
+        K = S phi / alpha,   S = S - gamma K phi^T,   gamma = 1 / (1 + sqrt(r / alpha))
+    Returns (x, S) as entry tuples.
+    """
+    s00, s01, s10, s11 = S
+    h0, h1 = h
+
+    phi0 = s00 * h0 + s10 * h1
+    phi1 = s01 * h0 + s11 * h1
+    alpha = phi0 * phi0 + phi1 * phi1 + r
+
+    k0 = (s00 * phi0 + s01 * phi1) / alpha
+    k1 = (s10 * phi0 + s11 * phi1) / alpha
+    gamma = 1.0 / (1.0 + (r / alpha) ** 0.5)
+
+    y = z - (h0 * x[0] + h1 * x[1])
+    x = (x[0] + k0 * y, x[1] + k1 * y)
+
+    gk0 = gamma * k0
+    gk1 = gamma * k1
+    S = (s00 - gk0 * phi0, s01 - gk0 * phi1, s10 - gk1 * phi0, s11 - gk1 * phi1)
+
+    return x, S
+
+# Batched 2x2 helpers for the smoother and the bank: a stack of 2x2 matrices is kept as its
+# four entries (a00, a01, a10, a11), each an array over time (or a scalar).
+
+def _split(M):
+    return M[:, 0, 0], M[:, 0, 1], M[:, 1, 0], M[:, 1, 1]
+
+def _mul(A, B):
+    return (A[0] * B[0] + A[1] * B[2], A[0] * B[1] + A[1] * B[3],
+            A[2] * B[0] + A[3] * B[2], A[2] * B[1] + A[3] * B[3])
+
+def _sub(A, B):
+    return tuple(a - b for a, b in zip(A, B))
+
+def _transpose(A):
+    return A[0], A[2], A[1], A[3]
+
+def _inv(A):
+    det = A[0] * A[3] - A[1] * A[2]
+    return A[3] / det, -A[1] / det, -A[2] / det, A[0] / det
+
+def _reverse_scan(C, bx, bP):
+    """
+    Compose the backward smoother maps s[k] = f_k(s[k+1]) for every k.
+
+    Each map is (C, bx, bP): x -> C x + bx and P -> C P C^T + bP. Instead of a
+    T-step Python loop, maps are composed pairwise in log2(T) vectorized passes
+    (prefix-scan doubling), after which map k is f_k o f_k+1 o ... o f_T-2.
+    Composition: (C1, bx1, bP1) o (C2, bx2, bP2) = (C1 C2, C1 bx2 + bx1, C1 bP2 C1^T + bP1).
+    """
+    C = [c.copy() for c in C]
+    bx = [b.copy() for b in bx]
+    bP = [b.copy() for b in bP]
+    n = C[0].shape[0]
+
+    shift = 1
+    while shift < n:
+        head = slice(None, n - shift)
+        tail = slice(shift, None)
+
+        C1 = tuple(c[head] for c in C)
+        C2 = tuple(c[tail] for c in C)
+        bx2 = tuple(b[tail] for b in bx)
+        bP2 = tuple(b[tail] for b in bP)
+
+        new_C = _mul(C1, C2)
+        new_bx = (C1[0] * bx2[0] + C1[1] * bx2[1] + bx[0][head],
+                  C1[2] * bx2[0] + C1[3] * bx2[1] + bx[1][head])
+        new_bP = _mul(_mul(C1, bP2), _transpose(C1))
+
+        for i in range(4):
+            C[i][head] = new_C[i]
+            bP[i][head] += new_bP[i]
+        for i in range(2):
+            bx[i][head] = new_bx[i]
+
+        shift *= 2
+
+    return C, bx, bP
@@ -0,0 +1,4 @@
+"""
+Helpers shared by the robotics projects (each project folder imports them by
+putting src/robotics on sys.path), so one fix reaches every copy of the math.
+"""
@@ -0,0 +1,29 @@
+# Responsibility - Discretize the damped double integrator used by the 1D and 2D plants
+
+import numpy as np
+
+def zoh_coefficients(damping, dt):
+    """
+    Closed-form exp(A dt) for A = [[0, 1], [0, -c]] and its input integral.
+
+    Returns (e, g1, g2):
+        e  = exp(-c dt)
+        g1 = (1 - e) / c                 (dt when c = 0)
+        g2 = (dt - g1) / c               (dt^2 / 2 when c = 0)
+    Small c*dt uses series expansions so there is no cancellation.
+    """
+    c = np.asarray(damping, dtype=float)
+    cdt = c * dt
+    small = np.abs(cdt) < 1e-4
+    safe_c = np.where(small, 1.0, c)
+
+    e = np.exp(-cdt)
+    g1 = np.where(small, dt * (1.0 - cdt / 2.0 + cdt**2 / 6.0), -np.expm1(-cdt) / safe_c)
+    g2 = np.where(small, dt**2 * (0.5 - cdt / 6.0 + cdt**2 / 24.0), (dt - g1) / safe_c)
+    return e, g1, g2
+
+def per_plant(value, n):
+    """
+    Copy a scalar or per-plant value into a float array of shape (n,).
+    """
+    return np.array(np.broadcast_to(np.asarray(value, dtype=float), (n,)))
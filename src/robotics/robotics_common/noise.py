@@ -0,0 +1,53 @@
+# Responsibility - Pre-draw sensor noise in blocks
+
+import numpy as np
+
+# noise samples drawn per refill of a NoiseBuffer
+NOISE_BLOCK_SIZE = 4096
+
+class NoiseBuffer:
+    """
+    Standard-normal noise pre-drawn in blocks.
+
+    One generator call per block instead of one per sample; the buffer is
+    refilled when it runs out.
+
+    rng: numpy.random.Generator for an independent stream. None keeps the legacy
+         global stream (np.random, so np.random.seed still makes runs repeatable);
+         blocks are drawn ahead, so other users of the global stream in between
+         see it shifted by up to block_size samples.
+    block_size: samples drawn per refill
+    """
+
+    def __init__(self, rng=None, block_size=NOISE_BLOCK_SIZE):
+        self.rng = rng if rng is not None else np.random
+        self.block_size = block_size
+
+        # stored as Python floats: scalar arithmetic on them is faster than on np.float64
+        self._block = []
+        self._index = 0
+
+    def next(self):
+        """
+        Return the next N(0, 1) sample, refilling the block when it runs out.
+        """
+        if self._index >= len(self._block):
+            self._block = self.rng.standard_normal(self.block_size).tolist()
+            self._index = 0
+
+        value = self._block[self._index]
+        self._index += 1
+        return value
+
+    def take(self, n):
+        """
+        Return the next n N(0, 1) samples as an array (same stream as calling next() n times).
+        """
+        buffered = self._block[self._index:self._index + n]
+        self._index += len(buffered)
+
+        rest = n - len(buffered)
+        if rest == 0:
+            return np.array(buffered)
+
+        return np.concatenate([buffered, self.rng.standard_normal(rest)])
@@ -0,0 +1,27 @@
+# Responsibility - Steady-state Kalman gain shared by the 1D filters
+
+import numpy as np
+
+def solve_dare(F, H, Q, R, P, tol, max_iter):
+    """
+    Fixed point of the Riccati recursion (predicted covariance) and its Kalman gain.
+
+    Iterates predict + update from P until the predicted covariance stops changing.
+    Returns (P_pred_inf, K_inf).
+    """
+    I = np.eye(F.shape[0])
+    P_pred = F @ P @ F.T + Q
+
+    for _ in range(max_iter):
+        S = H @ P_pred @ H.T + R
+        K = P_pred @ H.T @ np.linalg.inv(S)
+        P_next = F @ ((I - K @ H) @ P_pred) @ F.T + Q
+
+        if np.max(np.abs(P_next - P_pred)) <= tol * max(1.0, np.max(np.abs(P_pred))):
+            P_pred = P_next
+            K = P_pred @ H.T @ np.linalg.inv(H @ P_pred @ H.T + R)
+            return P_pred, K
+
+        P_pred = P_next
+
+    raise RuntimeError(f"Riccati recursion did not converge in {max_iter} iterations")